@@ -18,24 +18,25 @@ def build_merge_protocol(target_path="../../../../../config/merge_protocol.md"):
 ---
 
 ### 🛡️ Module Classification
-1. **seed_module**: Suffix 0 immutable genesis.
-2. **branch_module**: Isolated functional node (db{{suffix}}).
-3. **merged_module**: Unified synchronorg system repository.
+The Synchron manifold utilizes three distinct module/repository types to ensure architectural integrity:
+
+1. **seed_module (seed repo)**: The immutable genesis (Suffix 0). It defines the system baseline types and core rituals.
+2. **branch_module (branch repo)**: A functional node (`db{{suffix}}`) developed in isolation. It contains its own local orchestration settings.
+3. **merged_module (system repo)**: The final unified assembly within the `synchronorg` organization, where branch_modules are integrated into the root.
 
 ### 🏗️ Isolated Branch Orchestration
-To prevent merge collisions, every branch_module is self-contained:
-- **Rule**: All branch settings live in `db{{suffix}}/config/module_config.json`.
-- **Rule**: All logic resides in `db{{suffix}}/workspace/`.
-- **Rule**: Branch modules MUST NOT modify root `/config` or `db0` files.
+To prevent merge collisions in the global organization, every branch_module is self-contained within its specific root directory (`db{{suffix}}`):
+- **Local Config**: `/db{{suffix}}/config/module_config.json`
+- **Local Workspace**: `/db{{suffix}}/workspace/`
+- **Local Readme**: `/db{{suffix}}/README.md`
 
-### 🔄 The Synchronization Loop
-1. **Spawn**: Create a `branch_module` (db{{suffix}}).
-2. **Develop**: Work strictly within the module directory.
-3. **Merge**: Transfer to `synchronorg` for collision-free integration into the `merged_module`.
+### 🔄 Collision-Safe Integration Loop
+1. **Spawn**: Use `new_module_builder.py` to create a `branch_module`.
+2. **Develop**: Work strictly within the module's own folder. Do not modify root-level `/config` or `db0` files.
+3. **Merge**: Transfer the `branch_module` repo to `synchronorg`. During integration, the unique `db{{suffix}}` folder is added to the system root. Because it is self-contained, no existing system files are touched, eliminating merge conflicts.
 
 ---
-*Integrity Check: PASS. Tiangan Decentralization Verified. Signature: bugsarefree*
-"""
+*Integrity Check: PASS. Tiangan Decentralization Verified. Signature: bugsarefree*"""
 
     target_dir = os.path.dirname(target_path)
     if target_dir and not os.path.exists(target_dir):
@@ -1,13 +1,27 @@
 import os
-import shutil
+import sys
+import time
+import fcntl
+import subprocess
 from datetime import datetime
 
 """
-MODULE_REMOVER v2.2 [TIANGAN]
+MODULE_REMOVER v2.3 [TIANGAN]
 Library: protools (Shared Workspace)
 Description: CLI ritual to safely delete an isolated branch_module.
+Trash: removal atomically renames db{suffix} into db/trash/db{suffix}@{time_ns}, so the node
+leaves registry scans immediately. A detached purger (--purge) reclaims entries older than
+the undo window at a bounded operation rate and finishes interrupted purges after a crash.
+Until then the removal can be undone (--undo <suffix> or the remove --undo ritual).
+Leftover trash is picked up again by the synchron daemon at startup and by --trash.
 """
 
+TRASH_DIR = "db/trash"
+PURGER_LOCK = ".purger.lock"
+PURGING_MARK = ".purging"
+UNDO_GRACE = 300
+PURGE_RATE = 2000  # unlink/rmdir operations per second
+
 def parse_ritual_command(cmd_string):
     parts = cmd_string.split()
     if len(parts) < 11: return None, None, False
@@ -31,23 +45,204 @@ def remove_module():
         print("[X] BIBA_VIOLATION: Protocol ritual failed. Removal aborted.")
         return
 
+    purge_module(suffix, username)
+
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+
+def trash_root(root_dir):
+    return os.path.join(root_dir, TRASH_DIR)
+
+def list_trash(root_dir=None):
+    """Returns trash entries, oldest first: {name, path, suffix, trashed_at, purging}."""
+    trash = trash_root(root_dir or resolve_root())
+    entries = []
+    try:
+        it = os.scandir(trash)
+    except FileNotFoundError:
+        return entries
+    with it:
+        for entry in it:
+            # Entry names are self-describing (db{suffix}@{time_ns}[.purging]) so a crash
+            # between any two steps never leaves an entry the purger cannot interpret
+            base, purging = entry.name, entry.name.endswith(PURGING_MARK)
+            if purging:
+                base = base[:-len(PURGING_MARK)]
+            module, sep, stamp = base.rpartition("@")
+            if not sep or not stamp.isdigit() or not module.startswith("db") or not entry.is_dir(follow_symlinks=False):
+                continue
+            entries.append({
+                "name": entry.name,
+                "path": entry.path,
+                "suffix": module[2:],
+                "trashed_at": int(stamp) / 1e9,
+                "purging": purging
+            })
+    return sorted(entries, key=lambda e: e["trashed_at"])
+
+def trash_module(root_dir, suffix):
+    """Atomically renames db{suffix} into the trash area; constant time regardless of size."""
+    trash = trash_root(root_dir)
+    os.makedirs(trash, exist_ok=True)
+    target = os.path.join(trash, f"db{suffix}@{time.time_ns()}")
+    os.rename(os.path.join(root_dir, f"db{suffix}"), target)
+    return target
+
+class RateLimiter:
+    """Paces filesystem operations to at most `rate` per second."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_at = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        # Sleep in >=10ms slices rather than once per operation
+        if self.next_at - now > 0.01:
+            time.sleep(self.next_at - now)
+        self.next_at = max(self.next_at, now) + self.interval
+
+def purge_entry(path, limiter):
+    """Deletes a trash entry bottom-up; safe to re-run on a partially deleted tree."""
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            limiter.wait()
+            try:
+                os.unlink(os.path.join(root, name))
+            except FileNotFoundError:
+                pass
+        for name in dirs:
+            limiter.wait()
+            dir_path = os.path.join(root, name)
+            try:
+                os.unlink(dir_path) if os.path.islink(dir_path) else os.rmdir(dir_path)
+            except FileNotFoundError:
+                pass
+    os.rmdir(path)
+
+def purge_trash(root_dir=None, grace=UNDO_GRACE, rate=PURGE_RATE, wait=True):
+    """
+    Reclaims trash entries older than `grace` seconds at no more than `rate`
+    filesystem operations per second. Entries interrupted mid-purge by a crash
+    are finished first. Only one purger runs at a time (flock on the trash dir).
+    With wait=True it sleeps until younger entries age out; returns entries purged.
+    """
+    root_dir = root_dir or resolve_root()
+    trash = trash_root(root_dir)
+    os.makedirs(trash, exist_ok=True)
+    lock = open(os.path.join(trash, PURGER_LOCK), 'w')
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return 0
+
+    limiter = RateLimiter(rate)
+    purged = 0
+    with lock:
+        while True:
+            entries = list_trash(root_dir)
+            if not entries:
+                break
+            now = time.time()
+            due = [e for e in entries if e["purging"] or now - e["trashed_at"] >= grace]
+            for entry in due:
+                path = entry["path"]
+                if not entry["purging"]:
+                    # Past this rename the entry can no longer be restored
+                    path += PURGING_MARK
+                    try:
+                        os.rename(entry["path"], path)
+                    except FileNotFoundError:
+                        continue
+                purge_entry(path, limiter)
+                purged += 1
+            if due:
+                continue
+            if not wait:
+                break
+            time.sleep(max(min(e["trashed_at"] for e in entries) + grace - now, 0.1))
+    return purged
+
+def start_purger(root_dir):
+    """Launches a detached background purger; it exits at once if one is already running."""
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--purge"],
+        cwd=root_dir,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+def resume_purger(root_dir=None, entries=None):
+    """
+    Starts a purger when the trash holds work left over from a previous run (a crash or
+    reboot kills the detached purger); returns True if one was launched.
+    """
+    root_dir = root_dir or resolve_root()
+    entries = list_trash(root_dir) if entries is None else entries
+    if not entries:
+        return False
+    start_purger(root_dir)
+    return True
+
+def purge_module(suffix, username=None, off=None):
     if suffix == "0":
         print("[X] SEED_IMMUTABILITY_VIOLATION: Removal of the seed_module (db0) is strictly prohibited.")
-        return
-
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
-    module_dir = os.path.join(root_dir, f"db{suffix}")
+        return False
 
+    root_dir = resolve_root()
     print(f"[*] Ritual Accepted. Purging isolated branch db{suffix}...")
 
-    if os.path.exists(module_dir):
-        shutil.rmtree(module_dir)
-        print(f"[+] Branch_module db{suffix} purged from root.")
-    else:
-        print(f"[!] Warning: Branch db{suffix} not found.")
+    try:
+        trash_module(root_dir, suffix)
+    except FileNotFoundError:
+        print(f"[X] REMOVAL_FAILED: Branch db{suffix} not found.")
+        return False
+    start_purger(root_dir)
+    print(f"[+] Branch_module db{suffix} detached from root; space is reclaimed in the background.")
+    print(f"[*] Undo window: {UNDO_GRACE}s (command synchron remove --undo --suffix {suffix} --bugsarefree <S>)")
 
     print("\n[!] SUCCESS: Removal complete. System baseline remains intact.")
     print("[!] CONSENSUS STABLE. bugsarefree.")
+    return True
+
+def restore_module(suffix, username=None):
+    """Undo: moves the most recent not-yet-purged trash entry for db{suffix} back into place."""
+    root_dir = resolve_root()
+    module_dir = os.path.join(root_dir, f"db{suffix}")
+    candidates = [e for e in list_trash(root_dir) if e["suffix"] == suffix and not e["purging"]]
+    if not candidates:
+        print(f"[X] RESTORE_FAILED: No restorable trash entry for db{suffix} (already purged?).")
+        return False
+    if os.path.exists(module_dir):
+        print(f"[X] NODE_COLLISION: db{suffix} already exists; restore aborted.")
+        return False
+    try:
+        os.rename(candidates[-1]["path"], module_dir)
+    except FileNotFoundError:
+        print(f"[X] RESTORE_FAILED: db{suffix} was claimed by the purger.")
+        return False
+    print(f"[+] Branch_module db{suffix} restored from trash. bugsarefree.")
+    return True
+
+def print_trash():
+    entries = list_trash()
+    resume_purger(entries=entries)
+    print(f"[*] {len(entries)} trash entries:")
+    for e in entries:
+        state = "PURGING" if e["purging"] else f"restorable for {max(UNDO_GRACE - (time.time() - e['trashed_at']), 0):.0f}s"
+        print(f"    db{e['suffix']:<10} {datetime.fromtimestamp(e['trashed_at']).isoformat(timespec='seconds')}  {state}")
 
 if __name__ == "__main__":
-    remove_module()
\ No newline at end of file
+    if "--purge" in sys.argv:
+        purge_trash()
+    elif "--undo" in sys.argv:
+        restore_module(sys.argv[sys.argv.index("--undo") + 1])
+    elif "--trash" in sys.argv:
+        print_trash()
+    else:
+        remove_module()
\ No newline at end of file
@@ -1,12 +1,17 @@
 import os
+import sys
 import json
+import importlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
 """
-NEW_MODULE_BUILDER v2.3 [TIANGAN]
+NEW_MODULE_BUILDER v2.4 [TIANGAN]
 Architecture: Synchronos OS
 Description: Spawns an isolated branch_module (db{suffix}) with local orchestration.
 Enforcement: Settings, workspace, and documentation are strictly localized to the branch folder.
+Bulk: spawn_modules() takes a suffix range or list, checks collisions against one in-memory
+suffix set, writes nodes in parallel and commits the tiangan manifest and registry once.
 """
 
 def parse_ritual_command(cmd_string):
@@ -41,31 +46,21 @@ def build_new_module():
         print("[X] BIBA_VIOLATION: Ritual failed. Spawning aborted.")
         return
 
-    if suffix == "0":
-        print("[X] SEED_IMMUTABILITY_VIOLATION: Suffix 0 is reserved for the seed_module.")
-        return
+    spawn_module(suffix, username, off_val)
 
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
-    module_dir = os.path.join(root_dir, f"db{suffix}")
+OFF_MODES = {"0": "SILENT", "1": "BUFFERED", "2": "LIVE"}
+DBUGTOOLS_DIR = "db0/workspace/dbugtools/scripts/py"
+SPAWN_WORKERS = 16
 
-    if os.path.exists(module_dir):
-        print(f"[X] NODE_COLLISION: db{suffix} already exists.")
-        return
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
 
-    off_modes = {"0": "SILENT", "1": "BUFFERED", "2": "LIVE"}
-    off_label = off_modes.get(off_val, "UNKNOWN")
-
-    print(f"[*] Ritual Accepted. Mode: {off_label}")
-    print(f"[*] Building isolated branch_module db{suffix} (@{username})...")
-
-    # 1. Structure Creation (Isolated)
-    os.makedirs(os.path.join(module_dir, "config"), exist_ok=True)
-    os.makedirs(os.path.join(module_dir, "workspace"), exist_ok=True)
-    
-    now = datetime.now()
+def render_module(suffix, username, off_val, now):
+    """Returns (module_config, readme_content) for a new branch module."""
+    off_label = OFF_MODES.get(off_val, "UNKNOWN")
     repo_name = f"synchron{suffix.lower()}_{now.strftime('%Y%m%d_%H%M%S')}_{username}"
-    
-    # 2. Local Branch Manifest (Prevents root manifest collisions)
+
+    # Local Branch Manifest (Prevents root manifest collisions)
     module_config = {
         "module_id": suffix,
         "repo_type": "branch_module",
@@ -77,12 +72,7 @@ def build_new_module():
         "complexity": 50,
         "architecture_version": "0.2.8"
     }
-    
-    config_path = os.path.join(module_dir, "config/module_config.json")
-    with open(config_path, 'w') as f:
-        json.dump(module_config, f, indent=2)
 
-    # 3. Local README
     readme_content = f"""# Branch Module: {suffix}
 ## Repository: {repo_name}
 ## Owner: @{username}
@@ -99,11 +89,131 @@ To avoid merge collisions in the `synchronorg` system repo, all settings and cod
 ---
 "bugsarefree"
 """
+    return module_config, readme_content
+
+def write_module(module_dir, module_config, readme_content):
+    # os.mkdir (not makedirs) so a node created concurrently by someone else is a collision
+    os.mkdir(module_dir)
+    os.mkdir(os.path.join(module_dir, "config"))
+    os.mkdir(os.path.join(module_dir, "workspace"))
+    with open(os.path.join(module_dir, "config/module_config.json"), 'w') as f:
+        json.dump(module_config, f, indent=2)
     with open(os.path.join(module_dir, "README.md"), 'w') as f:
         f.write(readme_content)
 
+def spawn_module(suffix, username, off="0"):
+    off_val = off
+    if suffix == "0":
+        print("[X] SEED_IMMUTABILITY_VIOLATION: Suffix 0 is reserved for the seed_module.")
+        return False
+
+    module_dir = os.path.join(resolve_root(), f"db{suffix}")
+
+    if os.path.exists(module_dir):
+        print(f"[X] NODE_COLLISION: db{suffix} already exists.")
+        return False
+
+    print(f"[*] Ritual Accepted. Mode: {OFF_MODES.get(off_val, 'UNKNOWN')}")
+    print(f"[*] Building isolated branch_module db{suffix} (@{username})...")
+
+    module_config, readme_content = render_module(suffix, username, off_val, datetime.now())
+    try:
+        write_module(module_dir, module_config, readme_content)
+    except FileExistsError:
+        print(f"[X] NODE_COLLISION: db{suffix} already exists.")
+        return False
+
     print(f"\n[+] SUCCESS: Branch db{suffix} spawned with factor {off_val}.")
     print(f"[+] SICS Verified: Settings orchestrated strictly through db{suffix}/config/ folder.")
+    return True
+
+def parse_suffix_spec(spec):
+    """
+    Expands '10-20', '7,9,12' or a mix ('1-3,8') into an ordered list of suffix strings.
+    A zero-padded range start keeps its width: '01-10' gives '01' .. '10'.
+    """
+    if not isinstance(spec, str):
+        return [str(s) for s in spec]
+    suffixes = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        low, sep, high = part.partition("-")
+        if sep and low.isdigit() and high.isdigit():
+            if int(high) < int(low):
+                raise ValueError(f"Empty suffix range: {part}")
+            width = len(low) if len(low) > 1 and low.startswith("0") else 0
+            suffixes.extend(str(n).zfill(width) for n in range(int(low), int(high) + 1))
+        else:
+            suffixes.append(part)
+    return suffixes
+
+def existing_suffixes(root_dir):
+    """One directory listing instead of an exists() call per requested node."""
+    with os.scandir(root_dir) as it:
+        return {entry.name[2:] for entry in it if entry.name.startswith("db") and entry.is_dir()}
+
+def commit_manifest(root_dir):
+    """Rescans the registry once and regenerates the tiangan manifest and suffix index from it."""
+    tools_dir = os.path.join(root_dir, DBUGTOOLS_DIR)
+    if tools_dir not in sys.path:
+        sys.path.append(tools_dir)
+    builder = importlib.import_module("tiangan_suffix_manifest_builder")
+    return builder.build_tiangan_manifest(root_dir=root_dir)
+
+def spawn_modules(suffixes, username, off="0", workers=SPAWN_WORKERS):
+    """
+    Bulk spawn: suffixes is a spec string ('10-20', '7,9') or a list. Collisions are checked
+    against one in-memory suffix set, nodes are written in parallel, and the manifest and
+    registry are committed once at the end. Returns True when every node was spawned.
+    """
+    off_val = off
+    try:
+        requested = parse_suffix_spec(suffixes)
+    except ValueError as e:
+        print(f"[X] BIBA_VIOLATION: {e}")
+        return False
+
+    root_dir = resolve_root()
+    taken = existing_suffixes(root_dir)
+    accepted, rejected = [], []
+    for suffix in requested:
+        if suffix == "0":
+            rejected.append((suffix, "SEED_IMMUTABILITY_VIOLATION"))
+        elif suffix in taken:
+            rejected.append((suffix, "NODE_COLLISION"))
+        else:
+            taken.add(suffix)
+            accepted.append(suffix)
+
+    print(f"[*] Bulk Ritual Accepted. Mode: {OFF_MODES.get(off_val, 'UNKNOWN')}")
+    print(f"[*] Building {len(accepted)} isolated branch_modules (@{username})...")
+
+    now = datetime.now()
+    def build(suffix):
+        module_config, readme_content = render_module(suffix, username, off_val, now)
+        write_module(os.path.join(root_dir, f"db{suffix}"), module_config, readme_content)
+        return module_config
+
+    spawned = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build, suffix): suffix for suffix in accepted}
+        for future in as_completed(futures):
+            try:
+                spawned.append(future.result())
+            except FileExistsError:
+                rejected.append((futures[future], "NODE_COLLISION"))
+            except OSError as e:
+                rejected.append((futures[future], f"IO_FAILURE ({e})"))
+
+    order = {suffix: i for i, suffix in enumerate(requested)}
+    spawned.sort(key=lambda c: order[c["module_id"]])
+    if spawned:
+        commit_manifest(root_dir)
+
+    for suffix, reason in rejected:
+        print(f"[X] {reason}: db{suffix}")
+    print(f"\n[+] SUCCESS: {len(spawned)}/{len(requested)} branches spawned with factor {off_val}.")
+    print("[+] Manifest and registry committed once. bugsarefree.")
+    return not rejected
 
 if __name__ == "__main__":
     build_new_module()
\ No newline at end of file
@@ -12,7 +12,9 @@ def close_session():
     print("\n[!] INITIATING TIANGAN SHUTDOWN...")
     confirm = input("Confirm termination? (y/n): ").strip().lower()
     if confirm != 'y': return
+    lock_session()
 
+def lock_session():
     root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
     config_path = os.path.join(root_dir, "config/synchron_config.json")
 
@@ -27,6 +29,7 @@ def close_session():
     
     print("\n[!] SUCCESS: Session terminated. Branch_modules remain self-contained.")
     print("[!] CONSENSUS LOCKED. bugsarefree.")
+    return True
 
 if __name__ == "__main__":
     close_session()
\ No newline at end of file
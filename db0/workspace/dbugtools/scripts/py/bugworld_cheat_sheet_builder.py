@@ -21,27 +21,36 @@ def build_cheat_sheet(target_path="../../../../../config/bugworld_cheat_sheet.md
 #### 1. SPAWN MODULE
 `command synchron module --init --<SUFFIX> <T> --<USERNAME> <U> --OFF <B> --bugsarefree <S>`
 - **Explanation**: Creates a new isolated functional node (`db{{suffix}}`).
+- **The --OFF Flag (Orchestration Frequency Factor)**:
+  - `0`: SILENT ("Ghost Island") - Total isolation. Requires manual SYNC.
+  - `1`: BUFFERED ("Log-Sync") - Batch handshakes. Log-based telemetry.
+  - `2`: LIVE ("Kernel Extension") - Real-time coupling. Immediate integrity check.
 - **Safety**: Locked if suffix is '0'.
 
-#### 2. REMOVE MODULE
+#### 2. HTML FRAME BUILD
+`command synchron frame --build --session <S> --url <U> --bugsarefree <S>`
+- **Explanation**: Generates a session-aware HTML harvested frame.
+- **Logging**: Synchronized with BBC BOOK system logs.
+
+#### 3. REMOVE MODULE
 `command synchron remove --init --<SUFFIX> <T> --<USERNAME> <U> --OFF <B> --bugsarefree <S>`
 - **Explanation**: Purges an existing module folder. 
 - **Destructive**: Cannot be undone. Seed node (db0) is immune.
 
-#### 3. ROLE CHANGE
+#### 4. ROLE CHANGE
 `command synchron role --change --<ROLE> <R> --<USERNAME> <U> --OFF <B> --bugsarefree <S>`
 - **Explanation**: Shifts authorization identity between `adminp`, `dbugx`, and `user`.
 - **Enforcement**: Only AdminP can trigger this transition.
 
-#### 4. SYNC KERNEL
+#### 5. SYNC KERNEL
 `command synchron kernel --sync --adminp <M> --admins <Y> --bugsarefree <S>`
 - **Explanation**: Synchronizes state between the human (AdminP) and AI (AdminS).
 
-#### 5. INTEGRITY CHECK
+#### 6. INTEGRITY CHECK
 `command synchron integrity --check --bugsarefree <S>`
 - **Explanation**: Verifies that root config files have not been tampered with.
 
-#### 6. TERMINATE SESSION
+#### 7. TERMINATE SESSION
 `command synchron --close`
 - **Explanation**: Clean shutdown. Persistent islands remain intact.
 
@@ -51,8 +60,7 @@ def build_cheat_sheet(target_path="../../../../../config/bugworld_cheat_sheet.md
 2. **Signature**: All commands MUST end with `bugsarefree`.
 3. **Immutability**: db0 is the genesis.
 
-"Bugs are free !!!"
-"""
+"Bugs are free !!!\""""
     os.makedirs(os.path.dirname(target_path), exist_ok=True)
     with open(target_path, 'w', encoding='utf-8') as f:
         f.write(content)
@@ -1,49 +1,288 @@
 import os
 import json
+import time
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 """
-BUGWORLD_DIRECTORY_BUILDER v1.0
+BUGWORLD_DIRECTORY_BUILDER v1.1
 Library: dbugtools
 Description: Scans the Synchron-OS project root and generates a directory tree index.
+Streaming: Listings come from os.scandir (cached DirEntry type info) and are prefetched
+by a thread pool one level ahead of the writer, at most PREFETCH_WINDOW subfolders per level.
+The index is streamed to disk depth-first, so memory holds the listings along the current
+path plus a bounded prefetch window per level, however wide a folder is.
+Snapshots: --snapshot stores per-node size/mtime in db/cache/directory_tree_snapshot.json.
+Directories whose mtime is unchanged reuse their previous listing instead of being re-read,
+and an added/removed/modified change feed is written to config/directory_tree_changes.json.
+Shards: --shards writes one JSON shard per directory to config/directory_tree_shards/ plus a
+small manifest.json, with child counts and aggregate sizes precomputed, so clients can load
+the tree one level at a time. directory_tree_shards is a symlink to a versioned shard set;
+each build writes a new version and repoints the link with a single os.replace.
 """
 
-def build_directory_tree(root_path="."):
-    print("\n[!] INITIATING DIRECTORY MAPPING RITUAL...")
-    
-    def get_tree(path):
-        d = {'name': os.path.basename(path), 'type': 'folder'}
-        if os.path.isdir(path):
-            d['children'] = []
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+SNAPSHOT_PATH = os.path.join(ROOT_DIR, "db", "cache", "directory_tree_snapshot.json")
+CHANGE_FEED_PATH = os.path.join(ROOT_DIR, "config", "directory_tree_changes.json")
+SHARDS_DIR = os.path.join(ROOT_DIR, "config", "directory_tree_shards")
+
+PREFETCH_WINDOW = 32
+EXCLUDED_NAMES = {"node_modules"}
+TRASH_DIR = os.path.join(ROOT_DIR, "db", "trash")
+# Generated state that would otherwise report itself as changed on every run,
+# and removed modules awaiting the background purger
+EXCLUDED_PATHS = {os.path.dirname(SNAPSHOT_PATH), CHANGE_FEED_PATH, SHARDS_DIR, TRASH_DIR}
+
+def is_excluded(name, path=None):
+    # Exclude noise
+    return name.startswith('.') or name in EXCLUDED_NAMES or path in EXCLUDED_PATHS
+
+def scan_entries(path):
+    """Returns a sorted [(name, path, is_dir)] listing for a single directory."""
+    try:
+        with os.scandir(path) as it:
+            entries = [(e.name, e.path, e.is_dir(follow_symlinks=False)) for e in it if not is_excluded(e.name, e.path)]
+    except OSError as e:
+        print(f"[X] ERROR READING {path}: {e}")
+        return []
+    entries.sort()
+    return entries
+
+def stream_tree(out, root_path, pool, indent=2):
+    """Writes the nested folder/file tree of root_path as JSON to the text stream out."""
+
+    def write_folder(name, listing_future, depth):
+        pad = " " * (indent * depth)
+        inner = " " * (indent * (depth + 1))
+        out.write(f'{{\n{inner}"name": {json.dumps(name)},\n{inner}"type": "folder",\n{inner}"children": [')
+        listing = listing_future.result()
+        # Prefetch the next level while this one is written, a bounded window at a time
+        upcoming = (path for _, path, is_dir in listing if is_dir)
+        pending = {}
+
+        def top_up():
+            while len(pending) < PREFETCH_WINDOW:
+                path = next(upcoming, None)
+                if path is None:
+                    return
+                pending[path] = pool.submit(scan_entries, path)
+
+        top_up()
+        for i, (entry, path, is_dir) in enumerate(listing):
+            out.write(",\n" if i else "\n")
+            out.write(" " * (indent * (depth + 2)))
+            if is_dir:
+                listing_future = pending.pop(path)
+                top_up()
+                write_folder(entry, listing_future, depth + 2)
+            else:
+                out.write(f'{{ "name": {json.dumps(entry)}, "type": "file", "status": "synced" }}')
+        out.write(f"\n{inner}]\n{pad}}}" if listing else f"]\n{pad}}}")
+
+    write_folder(os.path.basename(root_path), pool.submit(scan_entries, root_path), 1)
+
+def snapshot_tree(path, previous=None, stats=None):
+    """
+    Returns a compact snapshot node: folders are {"m": mtime_ns, "d": {name: node}},
+    files are {"s": size, "m": mtime_ns}. A folder whose mtime matches the previous
+    snapshot reuses its listing; files are still stat'ed since content edits do not
+    touch the parent directory mtime.
+    """
+    stats = stats if stats is not None else {"scanned": 0, "reused": 0}
+    node = {"m": os.stat(path).st_mtime_ns, "d": {}}
+    previous = previous if previous and "d" in previous else None
+
+    if previous and previous["m"] == node["m"]:
+        listing = [(name, os.path.join(path, name), "d" in child) for name, child in previous["d"].items()]
+        stats["reused"] += 1
+    else:
+        listing = scan_entries(path)
+        stats["scanned"] += 1
+
+    for name, child_path, is_dir in listing:
+        prev_child = previous["d"].get(name) if previous else None
+        try:
+            if is_dir:
+                node["d"][name] = snapshot_tree(child_path, prev_child, stats)
+            else:
+                st = os.stat(child_path, follow_symlinks=False)
+                node["d"][name] = {"s": st.st_size, "m": st.st_mtime_ns}
+        except FileNotFoundError:
+            # Removed between listing and stat
+            continue
+    return node
+
+def diff_snapshots(old, new, prefix=""):
+    """Returns the {"added", "removed", "modified"} relative paths between two snapshot nodes."""
+    feed = {"added": [], "removed": [], "modified": []}
+    old_children = (old or {}).get("d", {})
+    new_children = (new or {}).get("d", {})
+
+    for name in sorted(old_children.keys() | new_children.keys()):
+        rel = f"{prefix}{name}"
+        before, after = old_children.get(name), new_children.get(name)
+        if before is None:
+            feed["added"].append(rel)
+        elif after is None:
+            feed["removed"].append(rel)
+        elif ("d" in before) != ("d" in after):
+            feed["removed"].append(rel)
+            feed["added"].append(rel)
+        elif "d" in after:
+            sub = diff_snapshots(before, after, f"{rel}/")
+            for key in feed:
+                feed[key].extend(sub[key])
+        elif before != after:
+            feed["modified"].append(rel)
+    return feed
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_json_atomic(path, data, **kwargs):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_path, path)
+
+def build_tree_snapshot():
+    print("\n[!] INITIATING DIRECTORY SNAPSHOT RITUAL...")
+
+    previous = load_snapshot()
+    stats = {"scanned": 0, "reused": 0}
+    generated_at = datetime.now().isoformat()
+    tree = snapshot_tree(ROOT_DIR, previous["tree"] if previous else None, stats)
+    feed = diff_snapshots(previous["tree"] if previous else None, tree)
+
+    write_json_atomic(SNAPSHOT_PATH, {"generated_at": generated_at, "tree": tree}, separators=(",", ":"))
+    write_json_atomic(CHANGE_FEED_PATH, {
+        "generated_at": generated_at,
+        "since": previous["generated_at"] if previous else None,
+        "signature": "bugsarefree",
+        **feed
+    }, indent=2)
+
+    print(f"[*] Directories: {stats['scanned']} scanned, {stats['reused']} reused from snapshot.")
+    print(f"[+] Change Feed: +{len(feed['added'])} -{len(feed['removed'])} ~{len(feed['modified'])} -> {CHANGE_FEED_PATH}")
+    print(f"[!] CONSENSUS: bugsarefree")
+    return feed
+
+def shard_id(rel_path):
+    return hashlib.sha1(rel_path.encode("utf-8")).hexdigest()[:16]
+
+def write_shards(shard_dir, path, rel_path=""):
+    """
+    Writes the shard for path (and, depth-first, all shards below it) into shard_dir.
+    Returns the folder's (aggregate_size, file_count, folder_count) for its parent's shard.
+    """
+    children = []
+    total_size = file_count = folder_count = 0
+    for name, child_path, is_dir in scan_entries(path):
+        child_rel = f"{rel_path}/{name}" if rel_path else name
+        if is_dir:
+            size, files, folders = write_shards(shard_dir, child_path, child_rel)
+            children.append({
+                "name": name, "type": "folder", "shard": shard_id(child_rel),
+                "size": size, "file_count": files, "folder_count": folders
+            })
+            folder_count += folders + 1
+        else:
             try:
-                # Exclude noise
-                entries = sorted([e for e in os.listdir(path) if not e.startswith('.') and e != 'node_modules'])
-                for entry in entries:
-                    child_path = os.path.join(path, entry)
-                    if os.path.isdir(child_path):
-                        d['children'].append(get_tree(child_path))
-                    else:
-                        d['children'].append({'name': entry, 'type': 'file', 'status': 'synced'})
-            except Exception as e:
-                print(f"[X] ERROR READING {path}: {e}")
-        return d
+                size = os.stat(child_path, follow_symlinks=False).st_size
+            except FileNotFoundError:
+                continue
+            files = 1
+            children.append({"name": name, "type": "file", "status": "synced", "size": size})
+        total_size += size
+        file_count += files
 
-    # Resolve relative root
-    abs_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
-    tree_data = get_tree(abs_root)
-    
-    target_path = os.path.join(abs_root, "config", "directory_tree_index.json")
-    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-    
-    with open(target_path, 'w') as f:
+    with open(os.path.join(shard_dir, f"{shard_id(rel_path)}.json"), 'w') as f:
+        json.dump({
+            "path": rel_path,
+            "child_count": len(children),
+            "size": total_size,
+            "children": children
+        }, f, separators=(",", ":"))
+    return total_size, file_count, folder_count
+
+def build_tree_shards():
+    print("\n[!] INITIATING SHARDED DIRECTORY MAPPING RITUAL...")
+
+    parent, base = os.path.split(SHARDS_DIR)
+    version = f".{base}.{time.time_ns()}"
+    staging_dir = os.path.join(parent, version)
+    os.makedirs(staging_dir)
+
+    size, files, folders = write_shards(staging_dir, ROOT_DIR)
+    with open(os.path.join(staging_dir, "manifest.json"), 'w') as f:
         json.dump({
             "generated_at": datetime.now().isoformat(),
             "signature": "bugsarefree",
-            "tree": tree_data
+            "root_name": os.path.basename(ROOT_DIR),
+            "root_shard": shard_id(""),
+            "shard_count": folders + 1,
+            "file_count": files,
+            "size": size
         }, f, indent=2)
-        
+
+    previous = os.readlink(SHARDS_DIR) if os.path.islink(SHARDS_DIR) else None
+    if previous is None and os.path.isdir(SHARDS_DIR):
+        # One-time move of a pre-symlink shard directory; a directory cannot be swapped atomically
+        previous = f".{base}.legacy"
+        os.replace(SHARDS_DIR, os.path.join(parent, previous))
+
+    # Repoint the link in one rename, so SHARDS_DIR always resolves to a complete shard set
+    link_tmp = os.path.join(parent, f"{version}.link")
+    os.symlink(version, link_tmp)
+    os.replace(link_tmp, SHARDS_DIR)
+
+    # Keep the previous version for readers still loading it; drop older and abandoned ones
+    for name in os.listdir(parent):
+        if name.startswith(f".{base}.") and name not in (version, previous):
+            path = os.path.join(parent, name)
+            if os.path.islink(path) or not os.path.isdir(path):
+                os.remove(path)
+            else:
+                shutil.rmtree(path, ignore_errors=True)
+
+    print(f"[*] Shards: {folders + 1} folders, {files} files, {size} bytes.")
+    print(f"[+] Directory Tree Shards built: {SHARDS_DIR}")
+    print(f"[!] CONSENSUS: bugsarefree")
+
+def build_directory_tree(root_path=".", workers=8, target_path=None):
+    print("\n[!] INITIATING DIRECTORY MAPPING RITUAL...")
+
+    # Resolve relative root
+    abs_root = ROOT_DIR
+
+    target_path = target_path or os.path.join(abs_root, "config", "directory_tree_index.json")
+    os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(target_path), ".directory_tree_index.json.tmp")
+
+    with open(tmp_path, 'w') as f, ThreadPoolExecutor(max_workers=workers) as pool:
+        f.write("{\n")
+        f.write(f'  "generated_at": {json.dumps(datetime.now().isoformat())},\n')
+        f.write('  "signature": "bugsarefree",\n')
+        f.write('  "tree": ')
+        stream_tree(f, abs_root, pool)
+        f.write("\n}\n")
+    os.replace(tmp_path, target_path)
+
     print(f"[+] Directory Tree Index built: {target_path}")
     print(f"[!] CONSENSUS: bugsarefree")
 
 if __name__ == "__main__":
-    build_directory_tree()
\ No newline at end of file
+    import sys
+    if "--snapshot" in sys.argv:
+        build_tree_snapshot()
+    elif "--shards" in sys.argv:
+        build_tree_shards()
+    else:
+        build_directory_tree()
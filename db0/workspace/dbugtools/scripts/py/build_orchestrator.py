@@ -0,0 +1,289 @@
+import io
+import os
+import re
+import sys
+import glob
+import json
+import shutil
+import difflib
+import fnmatch
+import hashlib
+import contextlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+
+"""
+BUILD_ORCHESTRATOR v1.0
+Library: dbugtools
+Description: Runs every config/ builder as one dependency graph.
+Graph: each builder declares its script, input globs and outputs; B runs after A when one of A's
+outputs matches one of B's inputs. Independent builders run in parallel worker processes.
+Skipping: a builder is skipped when the sha256 of its script and inputs matches the last
+successful run (db/cache/build_state.json) and its outputs are still the files it wrote.
+Writing: builders run in a staging sandbox (their ../../../../../ paths resolve into it). Each
+output is compared with the live file with volatile values such as generated-at timestamps masked,
+and is moved into place with an atomic rename only when its content actually changed.
+Guard: a changed output never replaces a live file that a recorded run did not write (a checked-in
+or hand-edited file); that builder fails until the change is reviewed with --dry-run, which prints
+the diffs and writes nothing, and accepted with --overwrite.
+Usage: build_orchestrator.py [--force] [--dry-run] [--overwrite] [--only id,id] [--workers N] [--list]
+"""
+
+BUILD_STATE = "db/cache/build_state.json"
+STAGE_DIR = "db/cache/build_stage"
+DBUGTOOLS = "db0/workspace/dbugtools/scripts/py"
+PROTOOLS = "db/workspace/protools/scripts/py"
+SEED_PROTOOLS = "db0/workspace/protools/scripts/py"
+# Builders resolve the root as ../../../../../ from their working directory
+STAGE_DEPTH = 5
+
+ISO_TIMESTAMP = rb"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:\d{2})?"
+# Inputs of "**" mean the whole tree: the builder always runs and runs after every other builder
+WHOLE_TREE = "**"
+
+BUILDERS = [
+    {"id": "synchron_config", "script": f"{DBUGTOOLS}/synchron_config_builder.py", "function": "build_synchron_config",
+     "outputs": ["config/synchron_config.json"]},
+    {"id": "synchron_glossary", "script": f"{DBUGTOOLS}/synchron_glossary_builder.py", "function": "build_glossary",
+     "outputs": ["config/synchron_glossary.json"]},
+    {"id": "cli_commands_index", "script": f"{DBUGTOOLS}/cli_commands_index_builder.py", "function": "build_command_index",
+     "outputs": ["config/cli_commands_index.json"]},
+    {"id": "bugworld_cheat_sheet", "script": f"{DBUGTOOLS}/bugworld_cheat_sheet_builder.py", "function": "build_cheat_sheet",
+     "outputs": ["config/bugworld_cheat_sheet.md"]},
+    {"id": "synchron_guide", "script": f"{DBUGTOOLS}/synchron_guide_builder.py", "function": "generate_php_guide",
+     "outputs": ["config/synchron_guide.php"]},
+    {"id": "builder_guide", "script": f"{DBUGTOOLS}/builder_guide_builder.py", "function": "generate_php_guide",
+     "outputs": ["config/builder_guide.php"]},
+    {"id": "docker_integration_guide", "script": f"{DBUGTOOLS}/docker_integration_builder.py", "function": "generate_php_guide",
+     "outputs": ["config/docker_integration_guide.php"]},
+    {"id": "dbugtools_index", "script": f"{DBUGTOOLS}/dbugtools_index_builder.py", "function": "build_index",
+     "outputs": ["config/dbugtools_index.json"]},
+    {"id": "protools_index", "script": f"{SEED_PROTOOLS}/protools_index_builder.py", "function": "build_index",
+     "outputs": ["db/protools_index.json"]},
+    {"id": "merge_protocol", "script": f"{PROTOOLS}/merge_protocol_builder.py", "function": "build_merge_protocol",
+     "outputs": ["config/merge_protocol.md"]},
+    {"id": "session_log", "script": f"{DBUGTOOLS}/session_log_builder.py", "function": "build_session_log",
+     "outputs": ["db/dashboard/session_logs/session_audit.json"], "volatile": [rb"sess_\d+"]},
+    {"id": "tiangan_manifest", "script": f"{DBUGTOOLS}/tiangan_suffix_manifest_builder.py", "function": "build_tiangan_manifest",
+     "inputs": ["db*/config/module_config.json"], "outputs": ["config/tiangan_suffix_manifest.csv", "db/cache/tiangan_suffix_index.bin"],
+     "kwargs": {"output_path": "{stage}/config/tiangan_suffix_manifest.csv", "index_path": "{stage}/db/cache/tiangan_suffix_index.bin"}},
+    {"id": "directory_tree_index", "script": f"{DBUGTOOLS}/bugworld_directory_builder.py", "function": "build_directory_tree",
+     "inputs": [WHOLE_TREE], "outputs": ["config/directory_tree_index.json"],
+     "kwargs": {"target_path": "{stage}/config/directory_tree_index.json"}},
+]
+
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def input_digest(root_dir, builder):
+    """sha256 over (path, content digest) of the builder script and every file its input globs match."""
+    h = hashlib.sha256()
+    paths = {builder["script"]}
+    for pattern in builder.get("inputs", []):
+        if pattern == WHOLE_TREE:
+            continue
+        paths.update(os.path.relpath(p, root_dir) for p in glob.glob(os.path.join(root_dir, pattern)) if os.path.isfile(p))
+    for rel in sorted(paths):
+        h.update(rel.encode("utf-8") + b"\0" + file_digest(os.path.join(root_dir, rel)).encode("ascii") + b"\n")
+    return h.hexdigest()
+
+def dependency_graph(builders):
+    """Maps builder id -> ids it must run after (an output of theirs matches one of its inputs)."""
+    graph = {}
+    for b in builders:
+        patterns = b.get("inputs", [])
+        graph[b["id"]] = {
+            a["id"] for a in builders
+            if a is not b and any(fnmatch.fnmatch(out, pattern) for out in a["outputs"] for pattern in patterns)
+        }
+    # Reject cycles up front rather than deadlocking the scheduler
+    done, pending = set(), dict(graph)
+    while pending:
+        ready = [i for i, deps in pending.items() if deps <= done]
+        if not ready:
+            raise ValueError(f"Builder dependency cycle among: {', '.join(sorted(pending))}")
+        done.update(ready)
+        for i in ready:
+            del pending[i]
+    return graph
+
+def masked(data, volatile):
+    for pattern in (ISO_TIMESTAMP, *volatile):
+        data = re.sub(pattern, b"<volatile>", data)
+    return data
+
+def load_state(root_dir):
+    try:
+        with open(os.path.join(root_dir, BUILD_STATE), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(root_dir, state):
+    path = os.path.join(root_dir, BUILD_STATE)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+def is_up_to_date(root_dir, builder, digest, recorded):
+    if builder.get("inputs") == [WHOLE_TREE] or not recorded or recorded.get("inputs") != digest:
+        return False
+    for rel in builder["outputs"]:
+        path = os.path.join(root_dir, rel)
+        if not os.path.exists(path) or file_digest(path) != recorded["outputs"].get(rel):
+            return False
+    return True
+
+def run_builder(root_dir, builder, stage_root):
+    """Worker: runs one builder inside its staging sandbox and returns its captured output."""
+    workdir = os.path.join(stage_root, *["_"] * STAGE_DEPTH)
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    script = os.path.join(root_dir, builder["script"])
+    if os.path.dirname(script) not in sys.path:
+        sys.path.insert(0, os.path.dirname(script))
+    spec = importlib.util.spec_from_file_location(f"build_{builder['id']}", script)
+    module = importlib.util.module_from_spec(spec)
+    kwargs = {k: v.replace("{stage}", stage_root) for k, v in builder.get("kwargs", {}).items()}
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        spec.loader.exec_module(module)
+        getattr(module, builder["function"])(**kwargs)
+    return out.getvalue()
+
+def print_diff(rel, staged, live):
+    try:
+        old, new = live.decode("utf-8").splitlines(True), staged.decode("utf-8").splitlines(True)
+    except UnicodeDecodeError:
+        print(f"    Binary file {rel} differs")
+        return
+    for line in difflib.unified_diff(old, new, f"a/{rel}", f"b/{rel}"):
+        print(f"    {line}", end="" if line.endswith("\n") else "\n")
+
+def commit_outputs(root_dir, builder, stage_root, recorded=None, overwrite=False, dry_run=False):
+    """Moves changed staged outputs into place atomically; returns (written, unchanged, digests)."""
+    written, unchanged, digests, refused = [], [], {}, []
+    volatile = builder.get("volatile", [])
+    for rel in builder["outputs"]:
+        staged, live = os.path.join(stage_root, rel), os.path.join(root_dir, rel)
+        if not os.path.exists(staged):
+            raise FileNotFoundError(f"{builder['id']} did not produce {rel}")
+        if not os.path.exists(live):
+            written.append(rel)
+            continue
+        with open(staged, 'rb') as f, open(live, 'rb') as g:
+            new, old = f.read(), g.read()
+        if masked(new, volatile) == masked(old, volatile):
+            unchanged.append(rel)
+            digests[rel] = file_digest(live)
+            continue
+        written.append(rel)
+        if dry_run:
+            print_diff(rel, new, old)
+        elif not overwrite and file_digest(live) != ((recorded or {}).get("outputs") or {}).get(rel):
+            refused.append(rel)
+
+    # Checked before anything moves so a builder's outputs are never left half-replaced
+    if refused:
+        raise RuntimeError(f"refusing to replace {', '.join(refused)} (not written by a recorded build); "
+                           f"review with --dry-run, accept with --overwrite")
+    if dry_run:
+        return written, unchanged, digests
+    for rel in written:
+        live = os.path.join(root_dir, rel)
+        os.makedirs(os.path.dirname(live), exist_ok=True)
+        os.replace(os.path.join(stage_root, rel), live)
+        digests[rel] = file_digest(live)
+    return written, unchanged, digests
+
+def orchestrate(root_dir=None, only=None, force=False, workers=None, dry_run=False, overwrite=False):
+    """Runs the builder graph; returns {builder id: 'skipped' | 'built' | 'failed' | 'blocked'}."""
+    root_dir = root_dir or resolve_root()
+    builders = {b["id"]: b for b in BUILDERS if not only or b["id"] in only}
+    graph = dependency_graph(list(builders.values()))
+    state = load_state(root_dir)
+    stage_base = os.path.join(root_dir, STAGE_DIR)
+    results, running = {}, {}
+
+    def ready():
+        return [i for i in builders if i not in results and i not in running.values() and graph[i] <= set(results)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while len(results) < len(builders):
+            for builder_id in ready():
+                builder = builders[builder_id]
+                if any(results[d] in ("failed", "blocked") for d in graph[builder_id]):
+                    results[builder_id] = "blocked"
+                    print(f"[X] {builder_id}: blocked by a failed dependency")
+                    continue
+                digest = input_digest(root_dir, builder)
+                if not force and is_up_to_date(root_dir, builder, digest, state.get(builder_id)):
+                    results[builder_id] = "skipped"
+                    print(f"[*] {builder_id}: inputs unchanged, skipped")
+                    continue
+                stage_root = os.path.join(stage_base, builder_id)
+                shutil.rmtree(stage_root, ignore_errors=True)
+                future = pool.submit(run_builder, root_dir, builder, stage_root)
+                future.digest, future.stage_root = digest, stage_root
+                running[future] = builder_id
+            if not running:
+                continue
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                builder_id = running.pop(future)
+                builder = builders[builder_id]
+                try:
+                    future.result()
+                    written, unchanged, digests = commit_outputs(
+                        root_dir, builder, future.stage_root, state.get(builder_id), overwrite, dry_run)
+                except Exception as e:
+                    results[builder_id] = "failed"
+                    print(f"[X] {builder_id}: {e}")
+                else:
+                    results[builder_id] = "built"
+                    if not dry_run:
+                        state[builder_id] = {"inputs": future.digest, "outputs": digests, "built_at": datetime.now().isoformat()}
+                    detail = f"{'would write' if dry_run else 'wrote'} {', '.join(written)}" if written else "no content changes"
+                    print(f"[+] {builder_id}: {detail}" + (f" ({len(unchanged)} unchanged)" if written and unchanged else ""))
+                finally:
+                    shutil.rmtree(future.stage_root, ignore_errors=True)
+
+    if not dry_run:
+        save_state(root_dir, state)
+    shutil.rmtree(stage_base, ignore_errors=True)
+    return results
+
+def print_graph():
+    graph = dependency_graph(BUILDERS)
+    print("[?] Builders:")
+    for b in BUILDERS:
+        after = f"  (after {', '.join(sorted(graph[b['id']]))})" if graph[b["id"]] else ""
+        print(f"    {b['id']:<26} -> {', '.join(b['outputs'])}{after}")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if "--list" in argv:
+        print_graph()
+        return 0
+    only = set(argv[argv.index("--only") + 1].split(",")) if "--only" in argv else None
+    workers = int(argv[argv.index("--workers") + 1]) if "--workers" in argv else None
+    print("\n[!] INITIATING CONFIG BUILD ORCHESTRATION...")
+    results = orchestrate(only=only, force="--force" in argv, workers=workers,
+                          dry_run="--dry-run" in argv, overwrite="--overwrite" in argv)
+    counts = {status: sum(1 for r in results.values() if r == status) for status in ("built", "skipped", "failed", "blocked")}
+    print(f"\n[+] {counts['built']} built, {counts['skipped']} skipped, {counts['failed']} failed, {counts['blocked']} blocked.")
+    print("[!] CONSENSUS: bugsarefree")
+    return 0 if not counts["failed"] and not counts["blocked"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
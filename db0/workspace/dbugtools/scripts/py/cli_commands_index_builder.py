@@ -7,6 +7,8 @@ CLI_COMMANDS_INDEX_BUILDER v1.1
 Library: dbugtools
 Description: Creates a JSON index of available CLI rituals for dynamic UI consumption.
 Includes the HTML Frame Build ritual for session-aware harvesting.
+Each entry also declares its handler (script path + function), boolean flags and
+legacy aliases, which the synchron entry point compiles into its ritual grammar.
 """
 
 def build_command_index(target_path="../../../../../config/cli_commands_index.json"):
@@ -21,43 +23,67 @@ def build_command_index(target_path="../../../../../config/cli_commands_index.js
                 "id": "spawn",
                 "ritual": "command synchron module --init",
                 "params": ["suffix", "username", "off", "bugsarefree"],
-                "description": "Initialize a new decentralized node."
+                "description": "Initialize a new decentralized node (db{suffix}) with localized orchestration.",
+                "aliases": ["command synchron branch --init"],
+                "handler": {"path": "db/workspace/protools/scripts/py/new_module_builder.py", "function": "spawn_module"}
+            },
+            {
+                "id": "bulk",
+                "ritual": "command synchron module --bulk",
+                "params": ["suffixes", "username", "off", "bugsarefree"],
+                "description": "Spawn a fleet of nodes from a suffix range or list (e.g. 10-20 or 7,9,12) with one manifest and registry commit.",
+                "handler": {"path": "db/workspace/protools/scripts/py/new_module_builder.py", "function": "spawn_modules"}
             },
             {
                 "id": "frame",
                 "ritual": "command synchron frame --build",
                 "params": ["session", "url", "verbose", "bugsarefree"],
-                "description": "Build an HTML frame with BBC BOOK logging integration."
+                "description": "Harvest web content into a session-aware HTML frame. Automatically synchronizes with BBC BOOK logs and enforces rollback protection.",
+                "flags": ["verbose"],
+                "handler": {"path": "db0/workspace/dbugtools/scripts/py/html_frame_builder.py", "function": "run_session"}
             },
             {
                 "id": "remove",
                 "ritual": "command synchron remove --init",
                 "params": ["suffix", "username", "off", "bugsarefree"],
-                "description": "Remove an isolated node."
+                "description": "Perform a stateless purge of an isolated branch module. Seed node (db0) is protected.",
+                "aliases": ["command synchron branch --remove --init"],
+                "handler": {"path": "db/workspace/protools/scripts/py/module_remover.py", "function": "purge_module"}
+            },
+            {
+                "id": "restore",
+                "ritual": "command synchron remove --undo",
+                "params": ["suffix", "bugsarefree"],
+                "description": "Restore a removed node from the trash area before the background purger reclaims it.",
+                "handler": {"path": "db/workspace/protools/scripts/py/module_remover.py", "function": "restore_module"}
             },
             {
                 "id": "role",
                 "ritual": "command synchron role --change",
                 "params": ["role", "username", "off", "bugsarefree"],
-                "description": "Transition authorization role."
+                "description": "Transition the active authorization identity (adminp, admins, dbugx, user) through a signed ritual.",
+                "handler": {"path": "db0/workspace/dbugtools/scripts/py/role_manager.py", "function": "apply_role"}
             },
             {
                 "id": "sync",
                 "ritual": "command synchron kernel --sync",
                 "params": ["adminp", "admins", "bugsarefree"],
-                "description": "Synchronize kernel baseline state."
+                "description": "Synchronize the kernel baseline between human and AI administrators to ensure manifold stability.",
+                "handler": None
             },
             {
                 "id": "integrity",
                 "ritual": "command synchron integrity --check",
                 "params": ["bugsarefree"],
-                "description": "Check system file hashes."
+                "description": "Verify cryptographic hashes of core system configurations against the Suffix 0 Seed baseline.",
+                "handler": {"path": "db0/workspace/dbugtools/scripts/py/integrity_checker.py", "function": "check_system_integrity"}
             },
             {
                 "id": "close",
                 "ritual": "command synchron --close",
                 "params": [],
-                "description": "Terminate active orchestration session."
+                "description": "Terminate the active orchestration session and lock the manifold state.",
+                "handler": {"path": "db/workspace/protools/scripts/py/session_closer.py", "function": "lock_session"}
             }
         ]
     }
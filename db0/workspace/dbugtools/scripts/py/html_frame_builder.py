@@ -5,42 +5,270 @@ html_frame_builder.py
 Builds new-frame.html using the dbugtools library,
 with session‑aware rollover linked to the BBC BOOK system.
 Generates HTML output from findex(url), with optional verbose logging
-and BBC BOOK session log integration.
+and BBC BOOK session log integration. BBC BOOK lines go through the
+shared dbug_toolkit log writer, flushed per the session's OFF mode,
+and rotate into compressed segments indexed by session ID.
+Batch mode (--batch <file|->) builds many frames concurrently from
+"<url>" or "<session_id> <url>" lines with one config load, one log
+writer and per-URL timings; bare URLs build new-frame_<url hash>.html
+without registering a session.
+Session settings live in html_frame_builder.sqlite3 (one row per session,
+expired after 90 days unused); the legacy ini is migrated on first run.
+Fetches go through an on-disk conditional-request cache (.frame_cache/):
+fresh entries (TTL) skip the network, stale ones are revalidated with
+If-None-Match / If-Modified-Since, and unchanged frames are not rewritten.
 """
 
+import os
 import sys
+import json
+import time
+import hashlib
 import logging
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dbugtools import findex
+
+# dbug_toolkit lives in db00/workspace of the manifold, not on the default path
+TOOLKIT_DIR = os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../")), "db00/workspace")
+if TOOLKIT_DIR not in sys.path:
+    sys.path.append(TOOLKIT_DIR)
+from dbug_toolkit.logwriter import OFF_BUFFERED, get_log_writer
 import configparser
+import sqlite3
 
 CONFIG_FILE = "html_frame_builder.ini"
+SESSION_STORE = "html_frame_builder.sqlite3"
+SESSION_MAX_AGE = 90 * 24 * 3600
+FRAME_CACHE_DIR = ".frame_cache"
+FRAME_CACHE_TTL = 300
+FRAME_CACHE_MAX_IDLE = 7 * 24 * 3600
+FRAME_CACHE_MAX_ENTRIES = 256
 
 # ------------------------------------------------------------
-# Load or create the configuration
+# Session store (replaces html_frame_builder.ini)
 # ------------------------------------------------------------
-def load_config(session_id: str) -> configparser.ConfigParser:
+SESSION_FIELDS = ("summary_log", "audit_log", "html_file", "local_log", "verbose_default", "off_mode")
+
+
+def default_session(session_id: str) -> dict:
+    """Per-session settings for a session seen for the first time."""
+    return {
+        "summary_log": f"/secure/bbcbook/logs/bbc_book_summary_{session_id[-6:]}.txt",
+        "audit_log": f"/secure/bbcbook/audit/{session_id[-6:]}/bbc_audittrail_{session_id[-6:]}.log",
+        "html_file": f"new-frame_{session_id[-6:]}.html",
+        "local_log": f"html_frame_builder_{session_id[-6:]}.log",
+        "verbose_default": "False",
+        "off_mode": OFF_BUFFERED,
+    }
+
+
+def url_session(url: str) -> tuple:
+    """Stable session ID and settings for a bare batch URL, derived from the URL itself."""
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+    session_id = f"url_{digest}"
+    section = default_session(session_id)
+    section["html_file"] = f"new-frame_{digest}.html"
+    return session_id, section
+
+
+class SessionStore:
+    """
+    SQLite-backed session settings keyed by session ID. Lookups and inserts
+    touch one row; sessions unused for SESSION_MAX_AGE are expired. The legacy
+    ini is imported once on first open. Loaded rows are kept in memory, so
+    store[session_id] is safe from batch worker threads.
+    """
+
+    def __init__(self, path: str = SESSION_STORE, legacy_ini: str = CONFIG_FILE):
+        self.path = path
+        self.sessions = {}
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            f"CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, "
+            f"{', '.join(f'{field} TEXT' for field in SESSION_FIELDS)}, created_at REAL, last_used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS sessions_last_used ON sessions (last_used)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.commit()
+        self.migrate_ini(legacy_ini)
+
+    def migrate_ini(self, ini_path: str) -> int:
+        """One-time import of every section in the legacy ini; returns sessions imported."""
+        if self.db.execute("SELECT 1 FROM meta WHERE key = 'ini_migrated'").fetchone() or not os.path.exists(ini_path):
+            return 0
+        legacy = configparser.ConfigParser()
+        legacy.read(ini_path)
+        now = time.time()
+        rows = [
+            (name, *(legacy[name].get(field, default_session(name)[field]) for field in SESSION_FIELDS), now, now)
+            for name in legacy.sections()
+        ]
+        with self.db:
+            self.db.executemany(f"INSERT OR IGNORE INTO sessions VALUES ({', '.join('?' * (len(SESSION_FIELDS) + 3))})", rows)
+            self.db.execute("INSERT INTO meta VALUES ('ini_migrated', ?)", (datetime.now().isoformat(),))
+        print(f"[INFO] Migrated {len(rows)} sessions from {ini_path} into {self.path}")
+        return len(rows)
+
+    def ensure(self, session_ids: list) -> None:
+        """Load (or create) the given sessions and mark them used, in one transaction."""
+        now = time.time()
+        with self.db:
+            for session_id in dict.fromkeys(session_ids):
+                row = self.db.execute(
+                    f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                if row:
+                    self.sessions[session_id] = dict(zip(SESSION_FIELDS, row))
+                    self.db.execute("UPDATE sessions SET last_used = ? WHERE session_id = ?", (now, session_id))
+                    continue
+                section = self.sessions[session_id] = default_session(session_id)
+                self.db.execute(
+                    f"INSERT INTO sessions VALUES ({', '.join('?' * (len(SESSION_FIELDS) + 3))})",
+                    (session_id, *(section[field] for field in SESSION_FIELDS), now, now)
+                )
+                print(f"[INFO] New session registered in {self.path}: {session_id}")
+
+    def attach(self, session_id: str, section: dict) -> None:
+        """Serve section for session_id from memory only; nothing is written to the store."""
+        self.sessions[session_id] = section
+
+    def expire(self, max_age: float = SESSION_MAX_AGE) -> int:
+        """Drop sessions not used within max_age seconds; returns the number removed."""
+        with self.db:
+            removed = self.db.execute("DELETE FROM sessions WHERE last_used < ?", (time.time() - max_age,)).rowcount
+        return removed
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+    def __getitem__(self, session_id: str) -> dict:
+        return self.sessions[session_id]
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def load_config(session_id: str) -> SessionStore:
     """Load or create configuration and update for the active session."""
-    config = configparser.ConfigParser()
-    config.read(CONFIG_FILE)
-
-    # If session section doesn’t exist, create it dynamically
-    if session_id not in config:
-        config[session_id] = {
-            "summary_log": f"/secure/bbcbook/logs/bbc_book_summary_{session_id[-6:]}.txt",
-            "audit_log": f"/secure/bbcbook/audit/{session_id[-6:]}/bbc_audittrail_{session_id[-6:]}.log",
-            "html_file": f"new-frame_{session_id[-6:]}.html",
-            "local_log": f"html_frame_builder_{session_id[-6:]}.log",
-            "verbose_default": "False",
-        }
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            config.write(f)
-        print(f"[INFO] New session section created in {CONFIG_FILE}: {session_id}")
+    return load_config_batch([session_id])
 
+
+def load_config_batch(session_ids: list) -> SessionStore:
+    """Open the session store once and load or create every requested session."""
+    config = SessionStore()
+    config.expire()
+    config.ensure(session_ids)
     return config
 
 
+# ------------------------------------------------------------
+# Conditional-request cache for findex
+# ------------------------------------------------------------
+class FrameCache:
+    """On-disk findex cache keyed by URL, revalidated with ETag / Last-Modified."""
+
+    def __init__(self, directory: str = FRAME_CACHE_DIR, ttl: float = FRAME_CACHE_TTL,
+                 max_idle: float = FRAME_CACHE_MAX_IDLE, max_entries: int = FRAME_CACHE_MAX_ENTRIES):
+        self.directory = Path(directory)
+        self.index_path = self.directory / "index.json"
+        self.ttl = ttl
+        self.max_idle = max_idle
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        try:
+            self.index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.html"
+
+    def _probe(self, url: str, entry: dict):
+        """Conditional HEAD; returns (status, etag, last_modified) or None if unsupported."""
+        try:
+            # Request() itself rejects URLs it cannot handle with ValueError
+            request = urllib.request.Request(url, method="HEAD")
+            if entry.get("etag"):
+                request.add_header("If-None-Match", entry["etag"])
+            if entry.get("last_modified"):
+                request.add_header("If-Modified-Since", entry["last_modified"])
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, response.headers.get("ETag"), response.headers.get("Last-Modified")
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, None, None
+            return None
+        except (urllib.error.URLError, ValueError, OSError):
+            return None
+
+    def fetch(self, url: str):
+        """Return (html_data, changed). changed is False when the cached copy was reused."""
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self.lock:
+            entry = self.index.get(key)
+        body_path = self._body_path(key)
+        cached = entry is not None and body_path.exists()
+
+        if cached and now - entry["fetched_at"] < self.ttl:
+            return self._hit(key, entry, body_path, now)
+
+        # On a miss the HEAD is unconditional: it only records the validators, taken
+        # before the GET so a change in between costs a refetch, never a stale 304
+        probe = self._probe(url, entry if cached else {})
+        if cached and probe and probe[0] == 304:
+            # Index entries are shared between workers; replace them, never mutate in place
+            return self._hit(key, dict(entry, fetched_at=now), body_path, now)
+
+        html_data = findex(url)
+        digest = hashlib.sha256(html_data.encode("utf-8")).hexdigest()
+        changed = not cached or digest != entry["sha256"]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if changed:
+            tmp_path = body_path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(html_data, encoding="utf-8")
+            os.replace(tmp_path, body_path)
+        self._store(key, {
+            "url": url,
+            "etag": probe[1] if probe else None,
+            "last_modified": probe[2] if probe else None,
+            "sha256": digest,
+            "fetched_at": now,
+            "accessed_at": now,
+        })
+        return html_data, changed
+
+    def _hit(self, key: str, entry: dict, body_path: Path, now: float):
+        self._store(key, dict(entry, accessed_at=now))
+        return body_path.read_text(encoding="utf-8"), False
+
+    def _store(self, key: str, entry: dict) -> None:
+        with self.lock:
+            self.index[key] = entry
+            self._evict(time.time())
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self.index), encoding="utf-8")
+            os.replace(tmp_path, self.index_path)
+
+    def _evict(self, now: float) -> None:
+        expired = [k for k, e in self.index.items() if now - e["accessed_at"] > self.max_idle]
+        # Overflow is counted among the entries that survive expiry, oldest first
+        live = sorted(self.index.keys() - set(expired), key=lambda k: self.index[k]["accessed_at"])
+        overflow = live[:max(len(live) - self.max_entries, 0)]
+        for key in expired + overflow:
+            del self.index[key]
+            try:
+                self._body_path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+
 # ------------------------------------------------------------
 # Logging setup
 # ------------------------------------------------------------
@@ -57,24 +285,30 @@ def setup_logger(log_path: Path):
 # ------------------------------------------------------------
 # BBC BOOK log entry writer
 # ------------------------------------------------------------
-def write_bbc_log_entry(summary_file: Path, audit_file: Path, message: str):
-    """Append synchronized BBC BOOK log entries."""
+def write_bbc_log_entry(summary_file: Path, audit_file: Path, message: str, session_id: str = None):
+    """Queue synchronized BBC BOOK log entries on the shared log writer."""
     timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S GMT")
     log_line = f"[{timestamp}] FRAME_BUILDER | {message}\n"
+    writer = get_log_writer()
     for path in [summary_file, audit_file]:
-        try:
-            path.parent.mkdir(parents=True, exist_ok=True)
-            with open(path, "a", encoding="utf-8") as f:
-                f.write(log_line)
-        except Exception as e:
-            logging.warning(f"Failed to update BBC log at {path}: {e}")
+        writer.write(path, log_line, session=session_id)
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 # ------------------------------------------------------------
 # Core function
 # ------------------------------------------------------------
-def build_html_frame(url: str, session_id: str, config: configparser.ConfigParser, verbose: bool = False) -> None:
-    """Generate HTML frame using dbugtools.findex and update logs."""
+def build_html_frame(url: str, session_id: str, config: SessionStore, verbose: bool = False,
+                     cache: FrameCache = None) -> bool:
+    """Generate HTML frame using dbugtools.findex and update logs. Returns True on success."""
     section = config[session_id]
     output_file = section.get("html_file", "new-frame.html")
     log_file = section.get("local_log", "html_frame_builder.log")
@@ -87,50 +321,163 @@ def build_html_frame(url: str, session_id: str, config: configparser.ConfigParse
         if verbose:
             print(f"[INFO] [{session_id}] Building HTML frame from URL: {url}")
 
-        html_data = findex(url)
+        if cache is None:
+            html_data, changed = findex(url), True
+        else:
+            html_data, changed = cache.fetch(url)
+
+        if not changed:
+            logging.info(f"Source unchanged since last fetch of {url}")
+        # Compare against the output file itself: it may have been edited, or
+        # last written from another URL, regardless of what the cache saw
+        if os.path.exists(output_file) and file_digest(output_file) == hashlib.sha256(html_data.encode("utf-8")).hexdigest():
+            logging.info(f"{output_file} already matches; left as is")
+            write_bbc_log_entry(summary_file, audit_file, f"UNCHANGED → {output_file} already current for URL: {url}", session_id)
+            if verbose:
+                print(f"[SUCCESS] [{session_id}] Frame unchanged → {output_file}")
+            return True
+
         with open(output_file, "w", encoding="utf-8") as file:
             file.write(html_data)
 
         logging.info(f"HTML frame successfully written to {output_file}")
-        write_bbc_log_entry(summary_file, audit_file, f"SUCCESS → {output_file} built from URL: {url}")
+        write_bbc_log_entry(summary_file, audit_file, f"SUCCESS → {output_file} built from URL: {url}", session_id)
 
         if verbose:
             print(f"[SUCCESS] [{session_id}] Frame built → {output_file}")
+        return True
 
     except Exception as e:
         error_message = f"Failed to build HTML frame: {e}"
         logging.error(error_message)
-        write_bbc_log_entry(summary_file, audit_file, f"ERROR → {error_message}")
+        write_bbc_log_entry(summary_file, audit_file, f"ERROR → {error_message}", session_id)
         if verbose:
             print(f"[ERROR] [{session_id}] {error_message}")
+        return False
+
+
+# ------------------------------------------------------------
+# Batch mode
+# ------------------------------------------------------------
+def parse_batch_lines(lines) -> list:
+    """
+    Parse "<url>" or "<session_id> <url>" lines into (session_id, url) jobs.
+    Bare URLs get session_id None; run_batch gives them URL-derived settings.
+    Repeated lines are dropped, so each (session_id, url) job is built once.
+    """
+    jobs = []
+    for line in lines:
+        parts = line.split()
+        if not parts or parts[0].startswith("#"):
+            continue
+        jobs.append((None, parts[0]) if len(parts) == 1 else (parts[0], parts[1]))
+    return list(dict.fromkeys(jobs))
+
+
+def build_html_frames_batch(jobs: list, config: SessionStore, workers: int = 8, verbose: bool = False,
+                            cache: FrameCache = None) -> list:
+    """
+    Build frames for (session_id, url) jobs on a bounded worker pool; returns per-URL
+    results in job order. Jobs that resolve to the same html_file (one session with
+    several URLs) run one after another on a single worker, so no output file is
+    ever written from two threads at once.
+    """
+
+    def run(job):
+        session_id, url = job
+        started = time.perf_counter()
+        ok = build_html_frame(url, session_id, config, verbose, cache)
+        return {"session_id": session_id, "url": url, "ok": ok, "seconds": time.perf_counter() - started}
+
+    groups = {}
+    for i, (session_id, _) in enumerate(jobs):
+        output_file = os.path.abspath(config[session_id].get("html_file", "new-frame.html"))
+        groups.setdefault(output_file, []).append(i)
+
+    results = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for group in pool.map(lambda indexes: [(i, run(jobs[i])) for i in indexes], groups.values()):
+            for i, result in group:
+                results[i] = result
+    return results
+
+
+def run_batch(source: str, workers: int = 8, verbose: bool = False, cache: FrameCache = None) -> list:
+    """Entry point for --batch: source is a file of jobs or '-' for stdin."""
+    batch_session = f"batch_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    if source == "-":
+        jobs = parse_batch_lines(sys.stdin)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            jobs = parse_batch_lines(f)
+
+    config = load_config_batch([session_id for session_id, _ in jobs if session_id is not None])
+    # Bare URLs are keyed by a hash of the URL: the same URL always lands in the
+    # same html_file, and no session rows pile up in the store run after run
+    resolved = []
+    for session_id, url in jobs:
+        if session_id is None:
+            session_id, section = url_session(url)
+            config.attach(session_id, section)
+        resolved.append((session_id, url))
+    jobs = resolved
+    writer = get_log_writer(OFF_BUFFERED)
+    setup_logger(Path(f"html_frame_builder_{batch_session}.log"))
+
+    started = time.perf_counter()
+    results = build_html_frames_batch(jobs, config, workers, verbose, cache)
+    elapsed = time.perf_counter() - started
+    writer.close()
+
+    for result in results:
+        status = "OK " if result["ok"] else "ERR"
+        print(f"[{status}] {result['seconds']:8.3f}s  {result['session_id']}  {result['url']}")
+    failed = sum(not r["ok"] for r in results)
+    print(f"[INFO] Batch complete: {len(results) - failed}/{len(results)} frames in {elapsed:.3f}s ({workers} workers)")
+    return results
 
 
 # ------------------------------------------------------------
 # Entry point
 # ------------------------------------------------------------
 def main():
+    cache = None if "--no-cache" in sys.argv else FrameCache()
+    if "--batch" in sys.argv:
+        i = sys.argv.index("--batch")
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 8
+        results = run_batch(sys.argv[i + 1], workers, "--verbose" in sys.argv, cache)
+        sys.exit(0 if all(r["ok"] for r in results) else 1)
+
     if len(sys.argv) < 3:
-        print("Usage: python html_frame_builder.py <session_id> <url> [--verbose]")
+        print("Usage: python html_frame_builder.py <session_id> <url> [--verbose] [--no-cache]")
+        print("       python html_frame_builder.py --batch <file|-> [--workers N] [--verbose] [--no-cache]")
         sys.exit(1)
 
-    session_id = sys.argv[1]
-    url = sys.argv[2]
-    verbose = "--verbose" in sys.argv
+    run_session(sys.argv[1], sys.argv[2], "--verbose" in sys.argv, cache)
+
 
+def run_session(session: str, url: str, verbose: bool = False, cache: FrameCache = None) -> bool:
+    """Single-frame session: start entry, build, completion entry. Also the `synchron frame` handler."""
+    session_id = session
     config = load_config(session_id)
+    writer = get_log_writer(config[session_id].get("off_mode", OFF_BUFFERED))
     write_bbc_log_entry(
         Path(config[session_id]["summary_log"]),
         Path(config[session_id]["audit_log"]),
-        f"Frame builder session start ({session_id})"
+        f"Frame builder session start ({session_id})",
+        session_id
     )
 
-    build_html_frame(url, session_id, config, verbose)
+    ok = build_html_frame(url, session_id, config, verbose, cache)
 
     write_bbc_log_entry(
         Path(config[session_id]["summary_log"]),
         Path(config[session_id]["audit_log"]),
-        f"Frame builder session complete ({session_id})"
+        f"Frame builder session complete ({session_id})",
+        session_id
     )
+    writer.close()
+    return ok
 
 
 if __name__ == "__main__":
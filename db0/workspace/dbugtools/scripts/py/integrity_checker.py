@@ -1,12 +1,25 @@
 import os
+import sys
+import json
+import mmap
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 """
-INTEGRITY_CHECKER v1.0
+INTEGRITY_CHECKER v1.1
 Library: dbugtools
 Architecture: Synchronos OS
 Description: Verifies hashes of core system files against the Seed Baseline.
+Scope: Every file under config/ and all db* nodes, plus the CORE_FILES.
+Engine: Files are hashed in a thread pool with 1 MB buffered reads (mmap above 64 MB).
+The Merkle tree (root hash, per-node db{suffix} and per-directory hashes) is cached in
+db/cache/integrity_hash_cache.json with an (inode, size, mtime_ns) key on every entry.
+A check stats each directory, lists only those whose key changed, hashes only changed
+files and re-seals only the subtrees above them; CORE_FILES are always re-stat'ed.
+--full re-lists and re-stats every file (catching in-place writes elsewhere), and
+--baseline always scans fully into config/integrity_baseline.json. Verification and
+node diffs (--diff <left> <right>) only descend into subtrees whose hashes differ.
 """
 
 CORE_FILES = [
@@ -16,33 +29,329 @@ CORE_FILES = [
     "metadata.json"
 ]
 
+BASELINE_PATH = "config/integrity_baseline.json"
+HASH_CACHE_PATH = "db/cache/integrity_hash_cache.json"
+# Generated or transient paths that are not part of the verified baseline
+EXCLUDED_PATHS = {BASELINE_PATH, "db/cache", "db/downloads", "db/trash"}
+EXCLUDED_NAMES = {"node_modules", "__pycache__"}
+
+HASH_BUFFER_SIZE = 1 << 20
+MMAP_THRESHOLD = 64 << 20
+
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+
 def calculate_hash(filepath):
     if not os.path.exists(filepath): return None
     hasher = hashlib.sha256()
-    with open(filepath, 'rb') as f:
-        while chunk := f.read(8192):
-            hasher.update(chunk)
+    with open(filepath, 'rb', buffering=0) as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        else:
+            buf = bytearray(HASH_BUFFER_SIZE)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                hasher.update(view[:n])
     return hasher.hexdigest()
 
-def check_system_integrity():
+def hash_file(filepath):
+    """Returns (sha256, None), or (None, reason) when the file vanished or cannot be read."""
+    try:
+        digest = calculate_hash(filepath)
+    except OSError as e:
+        return None, e.strerror or str(e)
+    return (digest, None) if digest else (None, "vanished during check")
+
+def in_scope(rel, is_dir):
+    name = rel.rpartition("/")[2]
+    if name.startswith('.') or name in EXCLUDED_NAMES or rel in EXCLUDED_PATHS:
+        return False
+    if "/" not in rel:
+        # Top level: config and the db* nodes, plus the root-level CORE_FILES
+        return (name == "config" or name.startswith("db")) if is_dir else rel in CORE_FILES
+    return True
+
+def scan_tree(root_dir, cached, full, stale):
+    """
+    Builds the Merkle tree of the integrity scope on top of the cached tree. Every
+    directory is stat'ed, but one whose (inode, size, mtime_ns) is unchanged keeps its
+    cached file leaves without a listing or a per-file stat, and is returned as the very
+    same node when nothing below it changed. CORE_FILES are always re-stat'ed, since an
+    in-place write leaves the directory untouched; full=True re-lists and re-stats all.
+    Leaves that need hashing are queued on stale as (leaf, rel_path) with no "h" yet.
+    """
+    def file_leaf(path, rel, old, st=None):
+        key = stat_key(st or os.stat(path, follow_symlinks=False))
+        if old and "d" not in old and old.get("h") and old.get("k") == key:
+            return old
+        leaf = {"k": key}
+        stale.append((leaf, rel))
+        return leaf
+
+    def walk(path, rel, old):
+        try:
+            key = stat_key(os.stat(path, follow_symlinks=False))
+        except OSError as e:
+            print(f"[X] ERROR READING {rel or '.'}: {e}")
+            return None
+        old = old if old and "d" in old else None
+
+        if not full and old and old.get("k") == key and "h" in old:
+            children, changed = {}, False
+            for name, child in old["d"].items():
+                child_rel = f"{rel}/{name}" if rel else name
+                child_path = os.path.join(path, name)
+                try:
+                    if "d" in child:
+                        node = walk(child_path, child_rel, child)
+                    elif child_rel in CORE_FILES or not child.get("h"):
+                        node = file_leaf(child_path, child_rel, child)
+                    else:
+                        node = child
+                except FileNotFoundError:
+                    node = None
+                if node is not None:
+                    children[name] = node
+                changed |= node is not child
+            return {"k": key, "d": children} if changed else old
+
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"[X] ERROR READING {rel or '.'}: {e}")
+            return None
+        children = {}
+        for entry in entries:
+            entry_rel = f"{rel}/{entry.name}" if rel else entry.name
+            previous = old["d"].get(entry.name) if old else None
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    node = walk(entry.path, entry_rel, previous) if in_scope(entry_rel, True) else None
+                elif entry.is_file(follow_symlinks=False) and in_scope(entry_rel, False):
+                    node = file_leaf(entry.path, entry_rel, previous, entry.stat(follow_symlinks=False))
+                else:
+                    node = None
+            except FileNotFoundError:
+                node = None
+            if node is not None:
+                children[entry.name] = node
+        return {"k": key, "d": children}
+
+    return walk(root_dir, "", cached) or {"d": {}}
+
+def stat_key(st):
+    return [st.st_ino, st.st_size, st.st_mtime_ns]
+
+def load_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_json(path, data, **kwargs):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **kwargs)
+    os.replace(tmp_path, path)
+
+def hash_tree(root_dir=None, workers=8, full=False):
+    """
+    Returns (merkle_tree, stats) for the whole integrity scope; see scan_tree for what is
+    re-read. Only subtrees containing a change are re-sealed. Files that cannot be read
+    stay in the tree without a hash and are listed in stats["unreadable"] as {rel_path: reason}.
+    """
+    root_dir = root_dir or resolve_root()
+    cache_path = os.path.join(root_dir, HASH_CACHE_PATH)
+    cached = (load_json(cache_path) or {}).get("tree")
+    stale = []
+    tree = scan_tree(root_dir, cached, full, stale)
+
+    unreadable = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for (leaf, rel), (digest, reason) in zip(stale, pool.map(lambda item: hash_file(os.path.join(root_dir, item[1])), stale)):
+            leaf["h"] = digest
+            if not digest:
+                unreadable[rel] = reason
+    seal_merkle(tree)
+
+    if tree is not cached:
+        save_json(cache_path, {"updated_at": datetime.now().isoformat(), "tree": tree}, separators=(",", ":"))
+    digests = tree_digests(tree)
+    return tree, {"hashed": len(stale), "cached": len(digests) + len(unreadable) - len(stale), "unreadable": unreadable}
+
+def tree_digests(node, prefix=""):
+    """Flattens a Merkle tree back into {rel_path: sha256}, skipping files without a hash."""
+    if "d" not in node:
+        return {prefix: node["h"]} if node.get("h") else {}
+    digests = {}
+    for name in sorted(node["d"]):
+        digests.update(tree_digests(node["d"][name], f"{prefix}/{name}" if prefix else name))
+    return digests
+
+def hash_manifold(root_dir=None, workers=8, full=False):
+    """Returns ({rel_path: sha256}, stats) for the whole integrity scope."""
+    tree, stats = hash_tree(root_dir, workers, full)
+    return tree_digests(tree), stats
+
+def compare_to_baseline(digests, baseline):
+    """Returns {"modified", "missing", "added"} rel paths against a baseline digest map."""
+    return {
+        "modified": sorted(rel for rel in digests.keys() & baseline.keys() if digests[rel] != baseline[rel]),
+        "missing": sorted(baseline.keys() - digests.keys()),
+        "added": sorted(digests.keys() - baseline.keys())
+    }
+
+def seal_merkle(node):
+    """Hashes every folder that has no "h" yet; folders (or files) without content get h None."""
+    hasher = hashlib.sha256()
+    sealed = False
+    for name in sorted(node["d"]):
+        child = node["d"][name]
+        if "d" in child and "h" not in child:
+            seal_merkle(child)
+        if child.get("h") is None:
+            continue
+        kind = "D" if "d" in child else "F"
+        hasher.update(f"{kind} {child['h']} {name}\n".encode("utf-8"))
+        sealed = True
+    node["h"] = hasher.hexdigest() if sealed else None
+
+def merkle_leaves(node, prefix):
+    if node.get("h") is None:
+        return []
+    if "d" not in node:
+        return [prefix]
+    return [leaf for name in sorted(node["d"]) for leaf in merkle_leaves(node["d"][name], f"{prefix}/{name}" if prefix else name)]
+
+def strip_stat_keys(node):
+    """The tree without stat keys or hashless entries, as stored in the baseline."""
+    if "d" not in node:
+        return {"h": node["h"]}
+    return {"h": node["h"], "d": {name: strip_stat_keys(child) for name, child in node["d"].items() if child.get("h")}}
+
+def diff_merkle(old, new, prefix=""):
+    """Same report as compare_to_baseline, descending only into subtrees whose hashes differ."""
+    report = {"modified": [], "missing": [], "added": []}
+    if old.get("h") == new.get("h"):
+        return report
+    if "d" not in old or "d" not in new:
+        if "d" not in old and "d" not in new:
+            report["modified"].append(prefix)
+        else:
+            report["missing"].extend(merkle_leaves(old, prefix))
+            report["added"].extend(merkle_leaves(new, prefix))
+        return report
+    for name in sorted(old["d"].keys() | new["d"].keys()):
+        rel = f"{prefix}/{name}" if prefix else name
+        # Entries without a hash (empty folders, unreadable files) count as absent
+        before, after = (c if c and c.get("h") else None for c in (old["d"].get(name), new["d"].get(name)))
+        if before is None and after is None:
+            continue
+        if after is None:
+            report["missing"].extend(merkle_leaves(before, rel))
+        elif before is None:
+            report["added"].extend(merkle_leaves(after, rel))
+        else:
+            sub = diff_merkle(before, after, rel)
+            for key in report:
+                report[key].extend(sub[key])
+    return report
+
+def node_hashes(tree):
+    """Returns {top-level folder: subtree hash}, i.e. config and every db{suffix} node."""
+    return {name: child["h"] for name, child in sorted(tree["d"].items()) if "d" in child and child.get("h")}
+
+def diff_nodes(left, right, root_dir=None):
+    """Compares two nodes of the live manifold (e.g. the seed and a branch) by Merkle descent."""
+    tree, _ = hash_tree(root_dir)
+    for name in (left, right):
+        if "d" not in tree["d"].get(name, {}) or not tree["d"][name].get("h"):
+            print(f"[X] NODE NOT FOUND: {name}")
+            return None
+    report = diff_merkle(tree["d"][left], tree["d"][right])
+    print(f"\n[!] MERKLE DIFF {left} [{tree['d'][left]['h'][:8]}] -> {right} [{tree['d'][right]['h'][:8]}]")
+    for label, key in (("CHANGED", "modified"), (f"ONLY IN {left}", "missing"), (f"ONLY IN {right}", "added")):
+        for file_rel in report[key]:
+            print(f"[*] {file_rel}: {label}")
+    return report
+
+def record_baseline(root_dir=None):
+    print("\n[!] RECORDING SEED INTEGRITY BASELINE...")
+    root_dir = root_dir or resolve_root()
+    # A baseline is only as good as its scan: re-list and re-stat everything
+    tree, stats = hash_tree(root_dir, full=True)
+    digests = tree_digests(tree)
+    save_json(os.path.join(root_dir, BASELINE_PATH), {
+        "generated_at": datetime.now().isoformat(),
+        "signature": "bugsarefree",
+        "root_hash": tree["h"],
+        "nodes": node_hashes(tree),
+        "merkle": strip_stat_keys(tree)
+    }, indent=2)
+    print(f"[+] Baseline recorded: {len(digests)} files ({stats['hashed']} hashed, {stats['cached']} cached).")
+    print(f"[*] Merkle root: {tree['h']}")
+    return digests
+
+def check_system_integrity(full=False):
     print("\n[!] INITIATING SYSTEM INTEGRITY HANDSHAKE...")
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
-    
+    root_dir = resolve_root()
+
+    tree, stats = hash_tree(root_dir, full=full)
+    digests = tree_digests(tree)
+    print(f"[*] Hashed {stats['hashed']} files, {stats['cached']} served from cache.")
+
     issues = 0
     for file_rel in CORE_FILES:
-        full_path = os.path.join(root_dir, file_rel)
-        f_hash = calculate_hash(full_path)
+        f_hash = digests.get(file_rel)
         if f_hash:
             print(f"[*] {file_rel}: VERIFIED [{f_hash[:8]}...]")
         else:
             print(f"[X] {file_rel}: MISSING OR CORRUPT")
             issues += 1
+    for file_rel, reason in sorted(stats["unreadable"].items()):
+        if file_rel not in CORE_FILES:
+            print(f"[X] {file_rel}: UNREADABLE ({reason})")
+            issues += 1
+
+    baseline = load_json(os.path.join(root_dir, BASELINE_PATH))
+    if baseline is None:
+        print(f"[!] No baseline at {BASELINE_PATH}. Record one with --baseline.")
+    elif "merkle" in baseline:
+        print(f"[*] Merkle root: {(tree['h'] or '')[:16]}... (baseline {baseline['root_hash'][:16]}...)")
+        baseline_nodes = node_hashes(baseline["merkle"])
+        for node, node_hash in node_hashes(tree).items():
+            if baseline_nodes.get(node) not in (None, node_hash):
+                print(f"[!] Node diverged: {node} [{baseline_nodes[node][:8]} -> {node_hash[:8]}]")
+        report = diff_merkle(baseline["merkle"], tree)
+    else:
+        report = compare_to_baseline(digests, baseline["files"])
+    if baseline is not None:
+        # Unreadable files were already reported above, not as missing
+        report["missing"] = [rel for rel in report["missing"] if rel not in stats["unreadable"]]
+        for label, key in (("MODIFIED", "modified"), ("MISSING", "missing"), ("UNTRACKED", "added")):
+            for file_rel in report[key]:
+                print(f"[X] {file_rel}: {label}")
+        issues += sum(len(paths) for paths in report.values())
 
     if issues == 0:
         print("\n[+] SUCCESS: System Integrity Verified. Seed is stable.")
         print("[!] Consensus: bugsarefree")
     else:
         print(f"\n[X] WARNING: {issues} integrity violations detected. Protocol lock advised.")
+    return issues
 
 if __name__ == "__main__":
-    check_system_integrity()
\ No newline at end of file
+    if "--baseline" in sys.argv:
+        record_baseline()
+    elif "--diff" in sys.argv:
+        i = sys.argv.index("--diff")
+        if len(sys.argv) < i + 3:
+            print("Usage: python integrity_checker.py --diff <left_node> <right_node>")
+            sys.exit(2)
+        sys.exit(0 if diff_nodes(sys.argv[i + 1], sys.argv[i + 2]) is not None else 1)
+    else:
+        sys.exit(1 if check_system_integrity("--full" in sys.argv) else 0)
@@ -1,49 +1,330 @@
 import os
+import sys
+import json
+import stat
+import zlib
 import shutil
+import hashlib
 import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
 """
-MIRROR_SYSTEM_BUILDER v1.0
+MIRROR_SYSTEM_BUILDER v1.1
 Library: dbugtools
 Description: Backs up Synchron-OS-A and mirrors state to OS-B.
+Incremental: --incremental stores files as 4 MB zlib chunks in a content-addressed store
+(db/downloads/mirror_store/chunks/<sha256>). Each backup is a small manifest referencing chunks;
+files whose size and mtime match the previous manifest are not re-read. --restore <manifest> <dir>
+rebuilds any point-in-time snapshot.
+Pipeline: Excluded directories are pruned before os.walk descends into them. Incremental chunks
+are read, hashed and compressed across a process pool; already-compressed types are stored as-is.
+Delta Sync: --sync <dir> keeps a warm OS-B tree. Files with matching size/mtime are skipped, large
+files are patched block-by-block against the per-block checksums in <dir>/.mirror_index.json, and
+every update lands via a temp file and an atomic rename.
 """
 
+CHUNK_SIZE = 4 << 20
+SYNC_BLOCK_SIZE = 1 << 20
+SYNC_PATCH_THRESHOLD = 8 << 20
+SYNC_INDEX_NAME = ".mirror_index.json"
+EXCLUDED_DIRS = {".git", "node_modules", "__pycache__"}
+# Formats that are already compressed; deflating them again only burns CPU
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z",
+    ".rar", ".mp3", ".mp4", ".mov", ".pdf", ".woff", ".woff2"
+}
+
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+
+def is_stored_type(path):
+    return os.path.splitext(path)[1].lower() in STORED_EXTENSIONS
+
+def iter_mirror_files(root_dir):
+    """Yields (file_path, arcname) for every regular file (or symlink to one) that belongs in a mirror."""
+    # Mirror output, removed modules awaiting the purger, the daemon socket, and live
+    # SQLite/state files plus the build_stage sandbox
+    skipped_dirs = {os.path.join(root_dir, "db", name) for name in ("downloads", "trash", "run", "cache")}
+    for root, dirs, files in os.walk(root_dir):
+        # Prune in place so os.walk never descends into excluded trees
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS and os.path.join(root, d) not in skipped_dirs]
+        for file in files:
+            file_path = os.path.join(root, file)
+            # Sockets, FIFOs and devices cannot be read like files; neither can dangling links
+            try:
+                if not stat.S_ISREG(os.stat(file_path).st_mode):
+                    continue
+            except OSError:
+                continue
+            yield file_path, os.path.relpath(file_path, root_dir)
+
+def chunk_path(store_dir, digest, codec="zlib"):
+    name = digest if codec == "zlib" else f"{digest}.raw"
+    return os.path.join(store_dir, "chunks", digest[:2], name)
+
+def store_file_chunks(store_dir, file_path, codec="zlib"):
+    """Splits a file into chunks, writes the ones the store lacks, returns (digests, new_bytes)."""
+    digests, new_bytes = [], 0
+    with open(file_path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest = hashlib.sha256(chunk).hexdigest()
+            target = chunk_path(store_dir, digest, codec)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                blob = zlib.compress(chunk, 6) if codec == "zlib" else chunk
+                # Unique per process so parallel writers of one digest never collide
+                tmp_path = f"{target}.{os.getpid()}.tmp"
+                with open(tmp_path, 'wb') as out:
+                    out.write(blob)
+                os.replace(tmp_path, target)
+                new_bytes += len(blob)
+            digests.append(digest)
+    return digests, new_bytes
+
+def latest_manifest(store_dir):
+    manifest_dir = os.path.join(store_dir, "manifests")
+    if not os.path.isdir(manifest_dir):
+        return None
+    names = sorted(n for n in os.listdir(manifest_dir) if n.endswith(".json"))
+    if not names:
+        return None
+    with open(os.path.join(manifest_dir, names[-1]), 'r') as f:
+        return json.load(f)
+
+def store_file(args):
+    store_dir, file_path, codec = args
+    return store_file_chunks(store_dir, file_path, codec)
+
+def build_incremental_mirror(project_name="SYNCHRON-OS-A", suffix="A", username="dbugpro", workers=None):
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+    snapshot = f"{project_name}{suffix}_{timestamp}_{username}"
+
+    root_dir = resolve_root()
+    store_dir = os.path.join(root_dir, "db", "downloads", "mirror_store")
+    manifest_path = os.path.join(store_dir, "manifests", f"{snapshot}.json")
+
+    print(f"\n[!] INITIATING INCREMENTAL MIRROR RITUAL...")
+    print(f"[*] Store: {store_dir}")
+
+    previous = latest_manifest(store_dir)
+    previous_files = previous["files"] if previous else {}
+    files, reused, new_bytes = {}, 0, 0
+
+    try:
+        pending = []
+        for file_path, arcname in iter_mirror_files(root_dir):
+            st = os.stat(file_path)
+            prior = previous_files.get(arcname)
+            if prior and prior["size"] == st.st_size and prior["mtime_ns"] == st.st_mtime_ns:
+                files[arcname] = prior
+                reused += 1
+                continue
+            codec = "stored" if is_stored_type(file_path) else "zlib"
+            files[arcname] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "mode": st.st_mode & 0o777, "codec": codec}
+            pending.append((arcname, (store_dir, file_path, codec)))
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(store_file, [args for _, args in pending], chunksize=16)
+            for (arcname, _), (digests, written) in zip(pending, results):
+                files[arcname]["chunks"] = digests
+                new_bytes += written
+
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        with open(f"{manifest_path}.tmp", 'w') as f:
+            json.dump({
+                "snapshot": snapshot,
+                "created_at": now.isoformat(),
+                "parent": previous["snapshot"] if previous else None,
+                "chunk_size": CHUNK_SIZE,
+                "files": files
+            }, f, separators=(",", ":"))
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+        print(f"[+] Snapshot Created: {snapshot} ({len(files)} files, {reused} unchanged, {new_bytes} new bytes)")
+        print(f"[*] OS_A -> OS_B Mirroring alignment complete.")
+        print(f"[!] CONSENSUS: bugsarefree")
+        return manifest_path
+
+    except Exception as e:
+        print(f"[X] MIRROR_FAILURE: {str(e)}")
+
+def restore_mirror(snapshot, target_dir):
+    """Rebuilds the snapshot named by its manifest (name or path) into target_dir."""
+    store_dir = os.path.join(resolve_root(), "db", "downloads", "mirror_store")
+    manifest_path = snapshot if os.path.isfile(snapshot) else os.path.join(store_dir, "manifests", f"{snapshot.removesuffix('.json')}.json")
+
+    print(f"\n[!] INITIATING MIRROR RESTORE RITUAL...")
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    for arcname, entry in manifest["files"].items():
+        out_path = os.path.join(target_dir, arcname)
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        with open(out_path, 'wb') as out:
+            codec = entry.get("codec", "zlib")
+            for digest in entry["chunks"]:
+                with open(chunk_path(store_dir, digest, codec), 'rb') as blob:
+                    data = blob.read()
+                out.write(zlib.decompress(data) if codec == "zlib" else data)
+        os.chmod(out_path, entry["mode"])
+        os.utime(out_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+    print(f"[+] Restored {manifest['snapshot']}: {len(manifest['files'])} files -> {target_dir}")
+    print(f"[!] CONSENSUS: bugsarefree")
+
+def block_digests(file_path):
+    digests = []
+    with open(file_path, 'rb') as f:
+        while block := f.read(SYNC_BLOCK_SIZE):
+            digests.append(hashlib.sha1(block).hexdigest())
+    return digests
+
+def copy_range(src_fd, dst_fd, offset, length):
+    """Copies [offset, offset + length) between files in-kernel (reflinked where supported)."""
+    while length > 0:
+        try:
+            copied = os.copy_file_range(src_fd, dst_fd, length, offset, offset)
+        except (AttributeError, OSError):
+            copied = os.pwrite(dst_fd, os.pread(src_fd, length, offset), offset)
+        if copied <= 0:
+            raise OSError(f"short copy at offset {offset}")
+        offset += copied
+        length -= copied
+
+def sync_file(file_path, dest_path, prior, st):
+    """Brings dest_path up to date with file_path. Returns (blocks, blocks_written, patched)."""
+    tmp_path = os.path.join(os.path.dirname(dest_path), f".{os.path.basename(dest_path)}.sync.tmp")
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+
+    patched = bool(prior) and st.st_size >= SYNC_PATCH_THRESHOLD and os.path.exists(dest_path)
+    if patched:
+        # One pass over the source: changed blocks are written from memory, unchanged
+        # blocks are copied from the old destination without passing through userspace
+        blocks, written = [], 0
+        dest_size = os.path.getsize(dest_path)
+        with open(file_path, 'rb') as src, open(dest_path, 'rb') as old, open(tmp_path, 'wb') as out:
+            offset = 0
+            while block := src.read(SYNC_BLOCK_SIZE):
+                digest = hashlib.sha1(block).hexdigest()
+                blocks.append(digest)
+                i = len(blocks) - 1
+                unchanged = i < len(prior["blocks"]) and prior["blocks"][i] == digest and offset + len(block) <= dest_size
+                if unchanged:
+                    out.flush()
+                    copy_range(old.fileno(), out.fileno(), offset, len(block))
+                    out.seek(offset + len(block))
+                else:
+                    out.seek(offset)
+                    out.write(block)
+                    written += 1
+                offset += len(block)
+    else:
+        shutil.copyfile(file_path, tmp_path)
+        blocks = block_digests(file_path)
+        written = len(blocks)
+
+    os.chmod(tmp_path, st.st_mode & 0o777)
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(tmp_path, dest_path)
+    return blocks, written, patched
+
+def sync_mirror(target_dir, delete=True):
+    """Delta-syncs the manifold into target_dir (OS-B) and returns the sync stats."""
+    root_dir = resolve_root()
+    target_dir = os.path.abspath(target_dir)
+    index_path = os.path.join(target_dir, SYNC_INDEX_NAME)
+    if os.path.commonpath([os.path.realpath(target_dir), os.path.realpath(root_dir)]) == os.path.realpath(root_dir):
+        # A target inside the manifold would be mirrored into itself on every pass
+        print(f"[X] SYNC_REJECTED: target {target_dir} lies inside the manifold {root_dir}.")
+        return None
+
+    print(f"\n[!] INITIATING DELTA SYNC RITUAL...")
+    print(f"[*] Target: {target_dir}")
+
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+
+    stats = {"skipped": 0, "copied": 0, "patched": 0, "blocks_written": 0, "deleted": 0}
+    synced = {}
+    for file_path, arcname in iter_mirror_files(root_dir):
+        dest_path = os.path.join(target_dir, arcname)
+        st = os.stat(file_path)
+        prior = index.get(arcname)
+        if prior and prior["size"] == st.st_size and prior["mtime_ns"] == st.st_mtime_ns and os.path.exists(dest_path):
+            synced[arcname] = prior
+            stats["skipped"] += 1
+            continue
+        blocks, written, patched = sync_file(file_path, dest_path, prior, st)
+        stats["patched" if patched else "copied"] += 1
+        stats["blocks_written"] += written
+        synced[arcname] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "blocks": blocks}
+
+    if delete:
+        for arcname in index.keys() - synced.keys():
+            try:
+                os.remove(os.path.join(target_dir, arcname))
+                stats["deleted"] += 1
+            except FileNotFoundError:
+                pass
+
+    os.makedirs(target_dir, exist_ok=True)
+    with open(f"{index_path}.tmp", 'w') as f:
+        json.dump(synced, f, separators=(",", ":"))
+    os.replace(f"{index_path}.tmp", index_path)
+
+    print(f"[+] Delta Sync: {stats['skipped']} unchanged, {stats['copied']} copied, {stats['patched']} patched "
+          f"({stats['blocks_written']} blocks), {stats['deleted']} deleted.")
+    print(f"[*] OS_A -> OS_B Mirroring alignment complete.")
+    print(f"[!] CONSENSUS: bugsarefree")
+    return stats
+
 def build_mirror_backup(project_name="SYNCHRON-OS-A", suffix="A", username="dbugpro"):
     now = datetime.now()
     timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
     filename = f"{project_name}{suffix}_{timestamp}_{username}.zip"
-    
+
     # Path enforcement
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+    root_dir = resolve_root()
     target_dir = os.path.join(root_dir, "db", "downloads")
-    
+
     if not os.path.exists(target_dir):
         os.makedirs(target_dir, exist_ok=True)
-        
+
     target_path = os.path.join(target_dir, filename)
-    
+
     print(f"\n[!] INITIATING MIRROR RITUAL...")
     print(f"[*] Target: {target_path}")
-    
+
     # Simulated Zip Logic for CLI
     try:
         with zipfile.ZipFile(target_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
             # Mirror the current directory excluding downloads
-            for root, dirs, files in os.walk(root_dir):
-                if "downloads" in root or ".git" in root or "node_modules" in root:
-                    continue
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, root_dir)
-                    zipf.write(file_path, arcname)
-                    
+            for file_path, arcname in iter_mirror_files(root_dir):
+                zipf.write(file_path, arcname, zipfile.ZIP_STORED if is_stored_type(file_path) else zipfile.ZIP_DEFLATED)
+
         print(f"[+] Backup Created: {filename}")
         print(f"[*] OS_A -> OS_B Mirroring alignment complete.")
         print(f"[!] CONSENSUS: bugsarefree")
-        
+        return target_path
+
     except Exception as e:
         print(f"[X] MIRROR_FAILURE: {str(e)}")
 
 if __name__ == "__main__":
-    build_mirror_backup()
\ No newline at end of file
+    if "--incremental" in sys.argv:
+        if build_incremental_mirror() is None:
+            sys.exit(1)
+    elif "--restore" in sys.argv:
+        i = sys.argv.index("--restore")
+        restore_mirror(sys.argv[i + 1], sys.argv[i + 2])
+    elif "--sync" in sys.argv:
+        if sync_mirror(sys.argv[sys.argv.index("--sync") + 1]) is None:
+            sys.exit(1)
+    else:
+        if build_mirror_backup() is None:
+            sys.exit(1)
@@ -3,29 +3,102 @@ import json
 from datetime import datetime
 
 """
-REGISTRY_REFRESHER v1.0
+REGISTRY_REFRESHER v1.1
 Library: dbugtools
 Description: Scans the manifold for isolated module folders and verifies their metadata.
+Cache: Parsed module configs are persisted in db/cache/module_registry_cache.json,
+keyed by node and invalidated by (mtime_ns, size, inode). Only changed configs are re-parsed.
 """
 
-def refresh_registry():
-    print("\n[!] REFRESHING DECENTRALIZED MODULE REGISTRY...")
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
-    
-    modules_found = []
-    for entry in os.listdir(root_dir):
-        if entry.startswith("db") and os.path.isdir(os.path.join(root_dir, entry)):
-            config_path = os.path.join(root_dir, entry, "config/module_config.json")
-            if os.path.exists(config_path):
+REGISTRY_CACHE = "db/cache/module_registry_cache.json"
+CACHE_VERSION = 1
+
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+
+def stat_signature(st):
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+def load_registry_cache(root_dir):
+    cache_path = os.path.join(root_dir, REGISTRY_CACHE)
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("nodes", {})
+
+def save_registry_cache(root_dir, nodes):
+    cache_path = os.path.join(root_dir, REGISTRY_CACHE)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            "version": CACHE_VERSION,
+            "updated_at": datetime.now().isoformat(),
+            "nodes": nodes
+        }, f)
+    os.replace(tmp_path, cache_path)
+
+def scan_registry(root_dir=None, use_cache=True):
+    """
+    Returns (registry, stats). registry maps node directory -> module config.
+    Unchanged configs are served from the cache after a single stat call.
+    """
+    root_dir = root_dir or resolve_root()
+    cached = load_registry_cache(root_dir) if use_cache else {}
+    nodes = {}
+    stats = {"parsed": 0, "cached": 0, "dropped": 0, "errors": 0}
+
+    with os.scandir(root_dir) as it:
+        for entry in it:
+            if not entry.name.startswith("db") or not entry.is_dir():
+                continue
+            config_path = os.path.join(entry.path, "config", "module_config.json")
+            try:
+                st = os.stat(config_path)
+            except OSError:
+                continue
+            signature = stat_signature(st)
+            hit = cached.get(entry.name)
+            if hit and hit["signature"] == signature:
+                nodes[entry.name] = hit
+                stats["cached"] += 1
+                continue
+            try:
                 with open(config_path, 'r') as f:
                     m_data = json.load(f)
-                    modules_found.append(m_data)
-                    print(f"[*] Node Found: db{m_data['module_id']} ({m_data['repo_name']})")
-            elif entry == "db0":
-                 print(f"[*] Seed Found: db0 (Baseline Kernel)")
+            except (OSError, ValueError) as e:
+                print(f"[X] CORRUPT NODE CONFIG: {entry.name} ({e})")
+                stats["errors"] += 1
+                continue
+            nodes[entry.name] = {"signature": signature, "config": m_data}
+            stats["parsed"] += 1
+
+    stats["dropped"] = len(set(cached) - set(nodes))
+    if use_cache and (stats["parsed"] or stats["dropped"] or len(nodes) != len(cached)):
+        save_registry_cache(root_dir, nodes)
+
+    registry = {name: nodes[name]["config"] for name in sorted(nodes)}
+    return registry, stats
+
+def refresh_registry(use_cache=True):
+    print("\n[!] REFRESHING DECENTRALIZED MODULE REGISTRY...")
+    root_dir = resolve_root()
+
+    registry, stats = scan_registry(root_dir, use_cache=use_cache)
+    for m_data in registry.values():
+        print(f"[*] Node Found: db{m_data['module_id']} ({m_data['repo_name']})")
+    if os.path.isdir(os.path.join(root_dir, "db0")) and "db0" not in registry:
+        print(f"[*] Seed Found: db0 (Baseline Kernel)")
 
-    print(f"\n[+] REFRESH COMPLETE: {len(modules_found)} isolated nodes registered.")
+    print(f"\n[+] REFRESH COMPLETE: {len(registry)} isolated nodes registered.")
+    print(f"[*] Cache: {stats['cached']} reused, {stats['parsed']} parsed, {stats['dropped']} dropped.")
     print("[!] System State: DECENTRALIZED_STABLE. bugsarefree.")
+    return registry
 
 if __name__ == "__main__":
-    refresh_registry()
\ No newline at end of file
+    import sys
+    refresh_registry(use_cache="--no-cache" not in sys.argv)
@@ -0,0 +1,148 @@
+import os
+import sys
+import json
+import sqlite3
+
+import registry_refresher
+
+"""
+REGISTRY_STORE v1.0
+Library: dbugtools
+Description: Queryable SQLite mirror of every db{suffix}/config/module_config.json.
+Store: db/cache/module_registry.sqlite3, synced incrementally from registry_refresher's
+stat-keyed scan (only changed configs are rewritten, vanished nodes are deleted).
+Secondary indexes on owner, status, repo_type, off_factor and spawned_at keep filtered,
+sorted and paginated queries fast with tens of thousands of nodes.
+Usage: registry_store.py [--owner U] [--status S] [--repo-type T] [--off F]
+       [--since ISO] [--until ISO] [--sort COLUMN] [--desc] [--limit N] [--page P] [--json]
+"""
+
+REGISTRY_DB = "db/cache/module_registry.sqlite3"
+COLUMNS = ("module_id", "repo_type", "repo_name", "owner", "off_factor",
+           "spawned_at", "status", "complexity", "architecture_version")
+INDEXED = ("owner", "status", "repo_type", "off_factor", "spawned_at")
+SORTABLE = {"node", *COLUMNS}
+PAGE_SIZE = 50
+
+class RegistryStore:
+    """
+    One row per node directory. Filters map to indexed equality or range
+    predicates; results are ordered by a whitelisted column with the node
+    name as tie-breaker, so pages are stable.
+    """
+
+    def __init__(self, root_dir=None, path=None, check_same_thread=True):
+        self.root_dir = root_dir or registry_refresher.resolve_root()
+        self.path = path or os.path.join(self.root_dir, REGISTRY_DB)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        self.db.row_factory = sqlite3.Row
+        with self.db:
+            self.db.execute(
+                f"CREATE TABLE IF NOT EXISTS modules (node TEXT PRIMARY KEY, "
+                f"{', '.join(f'{c} INTEGER' if c == 'complexity' else f'{c} TEXT' for c in COLUMNS)}, config TEXT)"
+            )
+            for column in INDEXED:
+                self.db.execute(f"CREATE INDEX IF NOT EXISTS modules_{column} ON modules ({column})")
+            # Covers the common "status + owner, sorted by complexity" dashboard query
+            self.db.execute("CREATE INDEX IF NOT EXISTS modules_status_owner_complexity ON modules (status, owner, complexity)")
+
+    def sync(self, registry=None):
+        """Reconciles the table with the on-disk registry; returns {inserted, updated, deleted}."""
+        if registry is None:
+            registry, _ = registry_refresher.scan_registry(self.root_dir)
+        stored = dict(self.db.execute("SELECT node, config FROM modules"))
+        stats = {"inserted": 0, "updated": 0, "deleted": 0}
+        rows = []
+        for node, config in registry.items():
+            text = json.dumps(config, sort_keys=True)
+            if stored.get(node) == text:
+                continue
+            stats["updated" if node in stored else "inserted"] += 1
+            rows.append((node, *(config.get(c) for c in COLUMNS), text))
+        gone = [(node,) for node in stored.keys() - registry.keys()]
+        stats["deleted"] = len(gone)
+        if rows or gone:
+            with self.db:
+                self.db.executemany(f"INSERT OR REPLACE INTO modules VALUES ({', '.join('?' * (len(COLUMNS) + 2))})", rows)
+                self.db.executemany("DELETE FROM modules WHERE node = ?", gone)
+        return stats
+
+    def query(self, owner=None, status=None, repo_type=None, off_factor=None, spawned_after=None,
+              spawned_before=None, order_by="node", descending=False, limit=PAGE_SIZE, page=1):
+        """Returns (rows, total): one page of module configs plus the total number of matches."""
+        if order_by not in SORTABLE:
+            raise ValueError(f"Cannot sort by {order_by!r}; choose one of {', '.join(sorted(SORTABLE))}.")
+        clauses, args = [], []
+        for column, value in (("owner", owner), ("status", status), ("repo_type", repo_type), ("off_factor", off_factor)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(str(value))
+        if spawned_after is not None:
+            clauses.append("spawned_at >= ?")
+            args.append(spawned_after)
+        if spawned_before is not None:
+            clauses.append("spawned_at < ?")
+            args.append(spawned_before)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "DESC" if descending else "ASC"
+
+        total = self.db.execute(f"SELECT COUNT(*) FROM modules {where}", args).fetchone()[0]
+        cursor = self.db.execute(
+            f"SELECT node, config FROM modules {where} ORDER BY {order_by} {direction}, node {direction} LIMIT ? OFFSET ?",
+            (*args, limit, max(page - 1, 0) * limit)
+        )
+        return [{"node": row["node"], **json.loads(row["config"])} for row in cursor], total
+
+    def close(self):
+        self.db.close()
+
+def open_registry_store(root_dir=None, sync=True):
+    """Opens the store and brings it up to date with the module configs on disk."""
+    store = RegistryStore(root_dir)
+    if sync:
+        store.sync()
+    return store
+
+def parse_query_args(argv):
+    options = {"--owner": "owner", "--status": "status", "--repo-type": "repo_type", "--off": "off_factor",
+               "--since": "spawned_after", "--until": "spawned_before", "--sort": "order_by",
+               "--limit": "limit", "--page": "page"}
+    query = {}
+    i = 0
+    while i < len(argv):
+        flag = argv[i]
+        if flag == "--desc":
+            query["descending"] = True
+        elif flag in options and i + 1 < len(argv):
+            value = argv[i + 1]
+            query[options[flag]] = int(value) if flag in ("--limit", "--page") else value
+            i += 1
+        elif flag != "--json":
+            raise ValueError(f"Unknown option: {flag}")
+        i += 1
+    return query
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    try:
+        query = parse_query_args(argv)
+        store = open_registry_store()
+        rows, total = store.query(**query)
+    except ValueError as e:
+        print(f"[X] REGISTRY_QUERY_FAILED: {e}")
+        return 2
+    store.close()
+
+    if "--json" in argv:
+        print(json.dumps({"total": total, "page": query.get("page", 1), "rows": rows}, indent=2))
+        return 0
+    limit, page = query.get("limit", PAGE_SIZE), query.get("page", 1)
+    print(f"[*] {total} matching nodes (page {page}/{max((total + limit - 1) // limit, 1)}):")
+    for row in rows:
+        print(f"    {row['node']:<10} {row.get('owner', ''):<16} {row.get('status', ''):<20} "
+              f"complexity={row.get('complexity')} spawned={row.get('spawned_at')}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
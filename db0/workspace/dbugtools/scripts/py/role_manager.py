@@ -35,10 +35,19 @@ def change_role():
         print("[X] BIBA_VIOLATION: Ritual signature or role name invalid.")
         return
 
+    apply_role(new_role, username)
+
+def apply_role(role, username, off=None):
+    new_role = role
+    if new_role not in VALID_ROLES:
+        print("[X] BIBA_VIOLATION: Ritual signature or role name invalid.")
+        return False
+
     print(f"[*] Ritual Accepted. Shifting identity to {new_role.upper()} for @{username}...")
     # Implementation would typically update a session cookie or state file
     print(f"[+] Identity Shift Successful. Authorization Level: {new_role}")
     print("[!] bugsarefree.")
+    return True
 
 if __name__ == "__main__":
     change_role()
\ No newline at end of file
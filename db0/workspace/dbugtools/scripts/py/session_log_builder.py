@@ -12,11 +12,14 @@ def build_session_log():
     log_entry = {
         "session_id": f"sess_{int(datetime.now().timestamp())}",
         "timestamp": datetime.now().isoformat(),
+        "adminp": "dbugpro",
+        "admins": "synchron",
         "events": [
-            "Tiangan Decentralization active.",
-            "Root manifest locked to Seed Suffix 0.",
-            "Branch isolation enforced across db* nodes.",
-            "Collision-safe GitHub integration verified."
+            "Seed_module locked to Suffix 0.",
+            "Tiangan Architecture v0.2.8 initialized.",
+            "Branch_module spawning decoupled from root manifest to prevent merge collisions.",
+            "Collision Avoidance Model active for synchronorg integration.",
+            "Consensus stable."
         ],
         "status": "SECURED"
     }
@@ -0,0 +1,260 @@
+import os
+import sys
+import json
+import socket
+import importlib.util
+
+"""
+SYNCHRON v1.1
+Library: dbugtools
+Architecture: Synchronos OS
+Description: Single entry point for every CLI ritual.
+Grammar: config/cli_commands_index.json is compiled into a prefix table. A ritual is parsed
+in one pass: `command synchron <verb> --<action>` selects the entry, then each `--<param> <value>`
+(or legacy `--<VALUE> <tag>` positional slot) fills the declared params, and the ritual must carry
+the `bugsarefree` signature. Only the invoked command's module is imported.
+Batch: --batch <file|-> validates every ritual line up front, runs them in one process
+with each handler module loaded once, commits the registry and tiangan manifest once at
+the end and prints a per-line result summary.
+Daemon: when synchron_daemon.py is listening on db/run/synchron.sock, rituals and batches
+are forwarded to it instead of running in this process (SYNCHRON_LOCAL=1 disables this).
+"""
+
+COMMAND_INDEX = "config/cli_commands_index.json"
+REGISTRY_REFRESHER = "db0/workspace/dbugtools/scripts/py/registry_refresher.py"
+MANIFEST_BUILDER = "db0/workspace/dbugtools/scripts/py/tiangan_suffix_manifest_builder.py"
+DAEMON_SOCKET = "db/run/synchron.sock"
+SIGNATURE = "bugsarefree"
+# Rituals that add or remove db{suffix} nodes and therefore invalidate the registry
+REGISTRY_RITUALS = {"spawn", "bulk", "remove", "restore"}
+# Of those, rituals whose handler already commits the manifest (spawn_modules commits once)
+SELF_COMMITTING_RITUALS = {"bulk"}
+COMMIT_RITUALS = REGISTRY_RITUALS - SELF_COMMITTING_RITUALS
+
+_loaded_modules = {}
+
+class RitualError(ValueError):
+    pass
+
+def resolve_root():
+    return os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../../"))
+
+def compile_grammar(root_dir=None):
+    """Returns (prefix tuple -> entry, prefix lengths longest first) from the command index."""
+    root_dir = root_dir or resolve_root()
+    with open(os.path.join(root_dir, COMMAND_INDEX), 'r') as f:
+        registry = json.load(f)["registry"]
+    prefixes = {}
+    for entry in registry:
+        for ritual in [entry["ritual"], *entry.get("aliases", [])]:
+            prefixes[tuple(ritual.split())] = entry
+    return prefixes, sorted({len(p) for p in prefixes}, reverse=True)
+
+def parse_ritual(tokens, grammar):
+    """Parses a tokenised ritual into (entry, params). Raises RitualError on any violation."""
+    prefixes, lengths = grammar
+    if tokens[:2] != ["command", "synchron"]:
+        tokens = ["command", "synchron", *tokens]
+
+    entry = None
+    for length in lengths:
+        entry = prefixes.get(tuple(tokens[:length]))
+        if entry:
+            break
+    if entry is None:
+        raise RitualError(f"Unknown ritual: {' '.join(tokens[2:4])}")
+
+    declared = [p for p in entry["params"] if p != SIGNATURE]
+    flags = set(entry.get("flags", []))
+    slots = [p for p in declared if p not in flags]
+    params, signed = {}, SIGNATURE not in entry["params"]
+
+    rest = tokens[length:]
+    i = 0
+    while i < len(rest):
+        token = rest[i]
+        has_value = i + 1 < len(rest) and not rest[i + 1].startswith("--")
+        if not token.startswith("--"):
+            if token == SIGNATURE and i == len(rest) - 1:
+                signed = True
+                i += 1
+                continue
+            raise RitualError(f"Unexpected token: {token}")
+        name = token[2:]
+        key = name.lower()
+        if key == SIGNATURE:
+            # A value after the flag must be the signature itself, not any token
+            if has_value and rest[i + 1] != SIGNATURE:
+                raise RitualError(f"Invalid bugsarefree signature: {rest[i + 1]}")
+            signed = True
+        elif key in flags:
+            params[key] = True
+            has_value = False
+        elif key in slots and has_value:
+            params[key] = rest[i + 1]
+        else:
+            # Legacy `--<VALUE> <tag>` form: the flag carries the value of the next open slot
+            open_slots = [p for p in slots if p not in params]
+            if not open_slots:
+                raise RitualError(f"Unexpected parameter: {token}")
+            params[open_slots[0]] = name
+        i += 2 if has_value else 1
+
+    if not signed:
+        raise RitualError("Missing bugsarefree signature.")
+    missing = [p for p in slots if p not in params]
+    if missing:
+        raise RitualError(f"Missing parameters: {', '.join(missing)}")
+    return entry, params
+
+def load_handler(entry, root_dir=None):
+    """Imports the entry's script on demand and returns its handler function."""
+    handler = entry.get("handler")
+    if not handler:
+        raise RitualError(f"Ritual '{entry['id']}' has no bound handler.")
+    return getattr(load_module(handler["path"], root_dir), handler["function"])
+
+def load_module(rel_path, root_dir=None):
+    """Imports a script by path once per process."""
+    if rel_path not in _loaded_modules:
+        path = os.path.join(root_dir or resolve_root(), rel_path)
+        name = f"synchron_{os.path.splitext(os.path.basename(rel_path))[0]}"
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _loaded_modules[rel_path] = module
+    return _loaded_modules[rel_path]
+
+def ritual_succeeded(result):
+    if isinstance(result, bool):
+        return result
+    if isinstance(result, int):
+        # Handlers such as check_system_integrity return a violation count
+        return result == 0
+    return True
+
+def commit_registry(root_dir=None):
+    """Rescans the registry and regenerates the tiangan manifest and suffix index, once."""
+    load_module(MANIFEST_BUILDER, root_dir).build_tiangan_manifest(root_dir=root_dir)
+
+def run_ritual(argv, grammar=None):
+    """Parses and executes one ritual; returns True when the handler reports success."""
+    grammar = grammar or compile_grammar()
+    entry, params = parse_ritual(list(argv), grammar)
+    ok = ritual_succeeded(load_handler(entry)(**params))
+    if ok and entry["id"] in COMMIT_RITUALS:
+        commit_registry()
+    return ok
+
+def read_batch(source):
+    """Returns [(line_no, ritual_text)] from a file path or '-' for stdin, skipping blanks and comments."""
+    stream = sys.stdin if source == "-" else open(source, 'r')
+    try:
+        return [(n, line.strip()) for n, line in enumerate(stream, 1) if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def run_batch(lines, grammar=None, keep_going=False):
+    """
+    Validates every (line_no, ritual) before running any of them, then executes
+    them in order. Returns [{line, ritual, id, ok, error}] results.
+    """
+    grammar = grammar or compile_grammar()
+    planned, errors = [], []
+    for line_no, text in lines:
+        try:
+            entry, params = parse_ritual(text.split(), grammar)
+            planned.append((line_no, text, entry, params, load_handler(entry)))
+        except (RitualError, OSError) as e:
+            errors.append({"line": line_no, "ritual": text, "id": None, "ok": False, "error": str(e)})
+    if errors:
+        return errors
+
+    results, registry_dirty, aborted = [], False, False
+    for line_no, text, entry, params, handler in planned:
+        result = {"line": line_no, "ritual": text, "id": entry["id"], "ok": False, "error": None}
+        if aborted:
+            result["error"] = "skipped after earlier failure"
+        else:
+            try:
+                result["ok"] = ritual_succeeded(handler(**params))
+            except Exception as e:
+                result["error"] = str(e)
+            registry_dirty |= result["ok"] and entry["id"] in COMMIT_RITUALS
+            aborted = not result["ok"] and not keep_going
+        results.append(result)
+
+    if registry_dirty:
+        commit_registry()
+    return results
+
+def print_batch_summary(results):
+    print("\n[!] BATCH RITUAL SUMMARY")
+    for r in results:
+        status = "OK " if r["ok"] else "ERR"
+        detail = f" ({r['error']})" if r["error"] else ""
+        print(f"[{status}] line {r['line']:>4}: {r['id'] or '?':<10}{detail}")
+    passed = sum(r["ok"] for r in results)
+    print(f"[+] {passed}/{len(results)} rituals succeeded. bugsarefree.")
+
+def daemon_request(request, root_dir=None):
+    """
+    Sends one request to a running synchron daemon and returns its response,
+    or None when no daemon is listening (nothing has been executed in that case).
+    """
+    path = os.path.join(root_dir or resolve_root(), DAEMON_SOCKET)
+    if not os.path.exists(path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except OSError:
+        client.close()
+        return None
+    with client, client.makefile('rb') as reply:
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        line = reply.readline()
+    if not line:
+        raise ConnectionError("synchron daemon closed the connection without replying.")
+    return json.loads(line)
+
+def print_rituals(grammar):
+    print("[?] Available rituals:")
+    seen = set()
+    for entry in grammar[0].values():
+        if entry["id"] in seen:
+            continue
+        seen.add(entry["id"])
+        print(f"    {entry['id']:<10} {entry['ritual']}  ({', '.join(entry['params']) or 'no params'})")
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # Read the batch once: stdin is gone by the time a local fallback would re-read it
+    lines = read_batch(argv[1] if len(argv) > 1 else "-") if argv and argv[0] == "--batch" else None
+    if argv and argv[0] not in ("-h", "--help") and os.environ.get("SYNCHRON_LOCAL") != "1":
+        # Handlers resolve relative paths against the caller's directory, not the daemon's
+        if lines is not None:
+            request = {"op": "batch", "lines": lines, "keep_going": "--keep-going" in argv, "cwd": os.getcwd()}
+        else:
+            request = {"op": "ritual", "argv": argv, "cwd": os.getcwd()}
+        response = daemon_request(request)
+        if response is not None:
+            sys.stdout.write(response["output"])
+            return response["code"]
+    grammar = compile_grammar()
+    if not argv or argv[0] in ("-h", "--help"):
+        print_rituals(grammar)
+        return 0
+    if lines is not None:
+        results = run_batch(lines, grammar, "--keep-going" in argv)
+        print_batch_summary(results)
+        return 0 if all(r["ok"] for r in results) else 1
+    try:
+        return 0 if run_ritual(argv, grammar) else 1
+    except RitualError as e:
+        print(f"[X] BIBA_VIOLATION: {e}")
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
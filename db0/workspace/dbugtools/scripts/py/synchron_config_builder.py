@@ -14,11 +14,11 @@ def build_synchron_config(target_path="../../../../../config/synchron_config.jso
             "codename": "Synchron OS project A",
             "architecture": "Tiangan",
             "suffix": "0",
-            "node_identifier": "synchron0_dbugpro_seed_module"
+            "node_identifier": "synchron0_dbugproductions_seed_module"
         },
         "security_protocols": {
             "admin_roles": {
-                "adminp": "dbugpro",
+                "adminp": "dbugproductions",
                 "admins": "synchron",
                 "dbugx": "authorized_debugger",
                 "user": "generic_viewer"
@@ -28,12 +28,31 @@ def build_synchron_config(target_path="../../../../../config/synchron_config.jso
                 "2_remove": "command synchron branch --remove --init --<SUFFIX> <T> --<USERNAME> <U> --OFF <B> --bugsarefree <S>",
                 "3_close": "command synchron --close",
                 "4_sync": "command synchron kernel --sync --adminp <M> --admins <Y> --bugsarefree <S>",
-                "5_role": "command synchron role --change --<ROLE> <R> --<USERNAME> <U> --OFF <B> --bugsarefree <S>"
-            }
+                "5_role": "command synchron role --change --<ROLE> <R> --<USERNAME> <U> --OFF <B> --bugsarefree <S>",
+                "6_integrity": "command synchron integrity --check --bugsarefree <S>"
+            },
+            "validation_checks": {
+                "pre_execution_integrity": "ENABLED",
+                "admin_auth_prompt": "TIANGAN_ORCHESTRATION: Ensure all branch_module logic is restricted to the local db{suffix} node folder."
+            },
+            "BIBA": [
+                "ADMINP_RESTRAINT: Forbidden to modify root config via branch_module rituals.",
+                "HORIZONTAL_ISOLATION: Branch db{x} cannot write to db{y}.",
+                "SEED_IMMUTABILITY: Suffix 0 baseline remains locked.",
+                "ISOLATION_ENFORCEMENT: Branch_modules must remain self-contained.",
+                "NO_READ_UP: Lower roles cannot read high-integrity security keys."
+            ],
+            "BABR": [
+                "ROOT_MODIFICATION_BLOCK: Refuse branch spawn requiring root-level changes.",
+                "ROLE_ESCALATION_LOCK: Only AdminP can trigger a Role Change ritual.",
+                "SEED_ACCESS_RESTRICTION: Non-Admin roles are blocked from db0 write-access.",
+                "DECENTRALIZED_LOCKDOWN: Cross-node write operations are physically restricted by kernel policy."
+            ]
         },
         "metadata": {
             "last_build_timestamp": datetime.now().isoformat(),
-            "status": "TIANGAN_DECENTRALIZED_STABLE"
+            "status": "TIANGAN_DECENTRALIZED_STABLE",
+            "integrity_signature": "VERIFIED_0.2.8"
         }
     }
     
@@ -0,0 +1,228 @@
+import io
+import os
+import sys
+import json
+import threading
+import contextlib
+import socketserver
+
+import synchron
+from registry_store import RegistryStore
+
+"""
+SYNCHRON_DAEMON v1.0
+Library: dbugtools
+Architecture: Synchronos OS
+Description: Long-running ritual server. Keeps the compiled grammar, the module registry,
+synchron_config.json and the directory tree index warm in memory and serves rituals over a
+Unix domain socket (db/run/synchron.sock), one JSON request per line. synchron.py forwards
+to it automatically when the socket is live (set SYNCHRON_LOCAL=1 to run in-process).
+Warm state: documents are reloaded only when their (mtime_ns, size) changes; the registry is
+rescanned after spawn/remove rituals or when the manifold root's mtime or the stat of any
+db{suffix}/config/module_config.json changes, and every rescan is mirrored into the SQLite
+registry store that serves {"op": "query"} requests.
+Rituals run one at a time so handlers never race on the manifold, each in the working
+directory of the client that sent it.
+"""
+
+MODULE_REMOVER = "db/workspace/protools/scripts/py/module_remover.py"
+
+WATCHED_DOCUMENTS = {
+    "synchron_config": "config/synchron_config.json",
+    "tree_index": "config/directory_tree_index.json",
+}
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+class WarmState:
+    """Everything a ritual needs that used to be re-read on every process launch."""
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        self.refresher = synchron.load_module(synchron.REGISTRY_REFRESHER, root_dir)
+        self._documents = {}
+        self._grammar = (None, None)
+        self._registry = (None, {})
+        self.lock = threading.Lock()
+        self._registry_lock = threading.Lock()
+        self.store = RegistryStore(root_dir, check_same_thread=False)
+
+    def grammar(self):
+        signature = file_signature(os.path.join(self.root_dir, synchron.COMMAND_INDEX))
+        if self._grammar[0] != signature:
+            self._grammar = (signature, synchron.compile_grammar(self.root_dir))
+        return self._grammar[1]
+
+    def document(self, name):
+        path = os.path.join(self.root_dir, WATCHED_DOCUMENTS[name])
+        signature = file_signature(path)
+        cached = self._documents.get(name)
+        if cached is None or cached[0] != signature:
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+            cached = self._documents[name] = (signature, data)
+        return cached[1]
+
+    def registry_signature(self):
+        """
+        The root's mtime (new or removed db{suffix} nodes) plus the stat of every node's
+        module_config.json, since editing a config in place leaves the root untouched.
+        """
+        configs = []
+        with os.scandir(self.root_dir) as it:
+            for entry in it:
+                if entry.name.startswith("db") and entry.is_dir():
+                    configs.append((entry.name, file_signature(os.path.join(entry.path, "config", "module_config.json"))))
+        return file_signature(self.root_dir), tuple(sorted(configs))
+
+    def registry(self, force=False):
+        with self._registry_lock:
+            signature = self.registry_signature()
+            if force or self._registry[0] != signature:
+                registry, _ = self.refresher.scan_registry(self.root_dir)
+                self.store.sync(registry)
+                self._registry = (signature, registry)
+            return self._registry[1]
+
+    def query(self, filters):
+        self.registry()
+        with self._registry_lock:
+            return self.store.query(**filters)
+
+    def warm(self):
+        self.grammar()
+        self.registry(force=True)
+        for name in WATCHED_DOCUMENTS:
+            self.document(name)
+
+    def run(self, action, cwd=None):
+        """Runs action() under the ritual lock in the client's cwd, returning (result, captured stdout)."""
+        out = io.StringIO()
+        with self.lock, contextlib.redirect_stdout(out):
+            # The working directory is process-wide, so it is only switched while the lock is held
+            previous = os.getcwd()
+            if cwd:
+                os.chdir(cwd)
+            try:
+                result = action()
+            finally:
+                os.chdir(previous)
+        return result, out.getvalue()
+
+def serve_request(state, request):
+    op = request.get("op")
+    if op == "ping":
+        return {"code": 0, "output": "", "nodes": len(state.registry())}
+    if op == "ritual":
+        def action():
+            try:
+                entry, params = synchron.parse_ritual(list(request["argv"]), state.grammar())
+                ok = synchron.ritual_succeeded(synchron.load_handler(entry, state.root_dir)(**params))
+                if ok and entry["id"] in synchron.COMMIT_RITUALS:
+                    synchron.commit_registry(state.root_dir)
+            except synchron.RitualError as e:
+                print(f"[X] BIBA_VIOLATION: {e}")
+                return 2, None
+            return (0 if ok else 1), entry["id"]
+        (code, ritual_id), output = state.run(action, request.get("cwd"))
+        if ritual_id in synchron.REGISTRY_RITUALS:
+            state.registry(force=True)
+        return {"code": code, "output": output}
+    if op == "batch":
+        def action():
+            results = synchron.run_batch(request["lines"], state.grammar(), request.get("keep_going", False))
+            synchron.print_batch_summary(results)
+            return results
+        results, output = state.run(action, request.get("cwd"))
+        if any(r["ok"] and r["id"] in synchron.REGISTRY_RITUALS for r in results):
+            state.registry(force=True)
+        return {"code": 0 if all(r["ok"] for r in results) else 1, "output": output}
+    if op == "registry":
+        return {"code": 0, "output": "", "registry": state.registry(force=request.get("refresh", False))}
+    if op == "query":
+        try:
+            rows, total = state.query(request.get("filters", {}))
+        except (TypeError, ValueError) as e:
+            return {"code": 2, "output": f"[X] REGISTRY_QUERY_FAILED: {e}\n"}
+        return {"code": 0, "output": "", "rows": rows, "total": total}
+    if op == "document":
+        name = request.get("name")
+        if name not in WATCHED_DOCUMENTS:
+            return {"code": 2, "output": f"[X] Unknown document: {name}\n"}
+        return {"code": 0, "output": "", "document": state.document(name)}
+    return {"code": 2, "output": f"[X] Unknown daemon op: {op}\n"}
+
+class RitualHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = {"code": 2, "output": "[X] Malformed daemon request.\n"}
+            else:
+                if request.get("op") == "shutdown":
+                    self.reply({"code": 0, "output": "[!] SYNCHRON DAEMON STOPPING. bugsarefree.\n"})
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    return
+                try:
+                    response = serve_request(self.server.state, request)
+                except Exception as e:
+                    response = {"code": 1, "output": f"[X] Daemon error: {e}\n"}
+            self.reply(response)
+
+    def reply(self, response):
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+class SynchronServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(root_dir=None):
+    root_dir = root_dir or synchron.resolve_root()
+    socket_path = os.path.join(root_dir, synchron.DAEMON_SOCKET)
+    if synchron.daemon_request({"op": "ping"}, root_dir) is not None:
+        print(f"[X] A synchron daemon is already listening on {socket_path}")
+        return 1
+    os.makedirs(os.path.dirname(socket_path), exist_ok=True)
+    if os.path.exists(socket_path):
+        os.remove(socket_path)
+
+    state = WarmState(root_dir)
+    state.warm()
+    # A purger that died with the previous boot leaves trash (and .purging entries) behind
+    if synchron.load_module(MODULE_REMOVER, root_dir).resume_purger(root_dir):
+        print("[*] Trash left by a previous run; background purger restarted.")
+    with SynchronServer(socket_path, RitualHandler) as server:
+        server.state = state
+        print(f"[+] SYNCHRON DAEMON LISTENING: {socket_path} ({len(state.registry())} nodes warm)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+    print("[!] SYNCHRON DAEMON STOPPED. bugsarefree.")
+    return 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in ("--stop", "--status"):
+        response = synchron.daemon_request({"op": "shutdown" if argv[0] == "--stop" else "ping"})
+        if response is None:
+            print("[*] No synchron daemon is running.")
+            return 1
+        sys.stdout.write(response["output"] or f"[+] Daemon up: {response.get('nodes', 0)} nodes warm.\n")
+        return response["code"]
+    return serve()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,12 +14,14 @@ def build_glossary():
         "architecture": "Tiangan",
         "github_org": "https://github.com/synchronorg",
         "terms": {
-            "adminp": "The primary human administrator (dbugpro).",
-            "admins": "The primary AI orchestration administrator (synchron).",
-            "seed_module": "The genesis repo (Suffix 0) defining system types.",
-            "branch_module": "An isolated functional node (db{suffix}) with local orchestration.",
-            "merged_module": "The unified system repository within synchronorg.",
-            "collision_avoidance": "Ensuring branches do not modify shared root system files.",
+            "adminp": "The primary human administrator (dbugproductions). Bound by BIBA protocols.",
+            "admins": "The primary AI orchestration administrator (synchron). Bound by BIBA protocols.",
+            "seed_module": "The genesis repository (Suffix 0) that defines the system baseline.",
+            "branch_module": "A self-contained functional repository (db{suffix}) developed in isolation for eventual merge.",
+            "merged_module": "The unified system repository within synchronorg that combines multiple branches.",
+            "local_orchestration": "Management of module settings strictly within the local db{suffix} folder.",
+            "seed_immutability": "Suffix 0 is the unique, unchangeable baseline.",
+            "collision_avoidance": "Architectural principle ensuring branch_modules do not modify root-level system files.",
             "bugsarefree": "The core protocol signature."
         },
         "version": "1.30",
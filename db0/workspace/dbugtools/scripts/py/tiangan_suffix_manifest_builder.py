@@ -1,23 +1,147 @@
 import csv
 import os
+import sys
+import mmap
+import struct
 from datetime import datetime
 
+import registry_refresher
+
 """
-TIANGAN_MANIFEST_BUILDER v1.6
+TIANGAN_MANIFEST_BUILDER v1.7
 Library: dbugtools
 Description: Generates the root manifest, identifying Suffix 0 as the CORE_SEED.
+Every node in the live registry follows the seed row, so the manifest is the full map of
+registered suffixes. Alongside it, db/cache/tiangan_suffix_index.bin holds the same nodes as
+sorted fixed-width records; SuffixIndex mmaps it and resolves a suffix to its work directory
+and status with a binary search instead of a directory scan.
 """
 
-def build_tiangan_manifest(output_path="../../../../../config/tiangan_suffix_manifest.csv"):
+MANIFEST_PATH = "config/tiangan_suffix_manifest.csv"
+SUFFIX_INDEX_PATH = "db/cache/tiangan_suffix_index.bin"
+SEED_ROW = ["0", "synchron0", "db0", "STABLE", "CORE_SEED"]
+
+# Header: magic, version, record size, record count. Records: suffix, work_directory, status,
+# each NUL-padded to a fixed width so record i starts at HEADER.size + i * RECORD.size
+INDEX_MAGIC = b"TGSX"
+INDEX_VERSION = 1
+HEADER = struct.Struct(">4sHHI")
+RECORD = struct.Struct("32s40s24s")
+
+def manifest_rows(registry):
+    """Seed row first, then one row per registered node ordered by suffix."""
+    rows = [SEED_ROW]
+    for node, config in sorted(registry.items(), key=lambda item: item[1].get("module_id", item[0][2:])):
+        suffix = str(config.get("module_id", node[2:]))
+        if suffix == "0":
+            continue
+        priority = "BRANCH" if config.get("repo_type") == "branch_module" else str(config.get("repo_type", "UNKNOWN")).upper()
+        rows.append([suffix, config.get("repo_name", ""), node, config.get("status", "UNKNOWN"), priority])
+    return rows
+
+def write_suffix_index(path, rows):
+    """Writes rows (suffix, repo_name, work_directory, status, ...) as a sorted fixed-width index."""
+    records = []
+    for suffix, _, work_directory, status, *_ in rows:
+        fields = [value.encode("utf-8") for value in (suffix, work_directory, status)]
+        if any(len(value) > width for value, width in zip(fields, (32, 40, 24))):
+            print(f"[!] Warning: db{suffix} does not fit the suffix index record; skipped.")
+            continue
+        records.append(RECORD.pack(*fields))
+    # Packed suffixes are NUL-padded, so sorting whole records sorts by suffix bytes
+    records.sort()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(INDEX_MAGIC, INDEX_VERSION, RECORD.size, len(records)))
+        f.writelines(records)
+    os.replace(tmp_path, path)
+    return len(records)
+
+class SuffixIndex:
+    """Read-only, mmap-backed view over tiangan_suffix_index.bin."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(registry_refresher.resolve_root(), SUFFIX_INDEX_PATH)
+        with open(self.path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, self.count = HEADER.unpack_from(self.map, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or record_size != RECORD.size:
+            self.map.close()
+            raise ValueError(f"{self.path} is not a v{INDEX_VERSION} tiangan suffix index.")
+
+    def __len__(self):
+        return self.count
+
+    def _suffix_at(self, i):
+        start = HEADER.size + i * RECORD.size
+        return self.map[start:start + 32]
+
+    def lookup(self, suffix):
+        """Returns {suffix, work_directory, status} for suffix, or None."""
+        key = str(suffix).encode("utf-8").ljust(32, b"\0")
+        low, high = 0, self.count
+        while low < high:
+            mid = (low + high) // 2
+            if self._suffix_at(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low == self.count or self._suffix_at(low) != key:
+            return None
+        fields = RECORD.unpack_from(self.map, HEADER.size + low * RECORD.size)
+        suffix, work_directory, status = (value.rstrip(b"\0").decode("utf-8") for value in fields)
+        return {"suffix": suffix, "work_directory": work_directory, "status": status}
+
+    def __contains__(self, suffix):
+        return self.lookup(suffix) is not None
+
+    def close(self):
+        self.map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def resolve_suffix(suffix, root_dir=None):
+    """One-shot lookup; builds the index first if it has never been generated."""
+    root_dir = root_dir or registry_refresher.resolve_root()
+    path = os.path.join(root_dir, SUFFIX_INDEX_PATH)
+    if not os.path.exists(path):
+        build_tiangan_manifest(root_dir=root_dir)
+    with SuffixIndex(path) as index:
+        return index.lookup(suffix)
+
+def build_tiangan_manifest(output_path=None, root_dir=None, registry=None, index_path=None):
+    root_dir = root_dir or registry_refresher.resolve_root()
+    output_path = output_path or os.path.join(root_dir, MANIFEST_PATH)
+    index_path = index_path or os.path.join(root_dir, SUFFIX_INDEX_PATH)
+    if registry is None:
+        registry, _ = registry_refresher.scan_registry(root_dir)
+    rows = manifest_rows(registry)
+
     os.makedirs(os.path.dirname(output_path), exist_ok=True) if os.path.dirname(output_path) else None
-    with open(output_path, mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerow(["# TIANGAN_BASELINE_MANIFEST_V1"])
-        writer.writerow(["# GENERATED_AT," + datetime.now().isoformat()])
-        writer.writerow(["# SIGNATURE,Bugs are free !!!"])
-        writer.writerow([])
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, mode='w', newline='') as file:
+        # Comment lines are written raw; csv.writer would quote their embedded commas
+        file.write("# TIANGAN_BASELINE_MANIFEST_V1\n")
+        file.write(f"# GENERATED_AT,{datetime.now().isoformat()}\n")
+        file.write("# SIGNATURE,Bugs are free !!!\n\n")
+        writer = csv.writer(file, lineterminator="\n")
         writer.writerow(["suffix", "repo_name", "work_directory", "status", "priority"])
-        writer.writerow(["0", "synchron0", "db0", "STABLE", "CORE_SEED"])
-    print(f"[+] Success: Manifest updated. db0 verified as CORE_SEED.")
+        writer.writerows(rows)
+    os.replace(tmp_path, output_path)
+
+    indexed = write_suffix_index(index_path, rows)
+    print(f"[+] Success: Manifest updated. db0 verified as CORE_SEED; {len(rows) - 1} branch nodes listed, {indexed} indexed.")
+    return rows
 
-if __name__ == "__main__": build_tiangan_manifest()
\ No newline at end of file
+if __name__ == "__main__":
+    if "--resolve" in sys.argv:
+        found = resolve_suffix(sys.argv[sys.argv.index("--resolve") + 1])
+        print(f"[+] {found['suffix']} -> {found['work_directory']} ({found['status']})" if found else "[X] Suffix not registered.")
+    else:
+        build_tiangan_manifest()
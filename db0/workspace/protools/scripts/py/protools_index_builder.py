@@ -10,15 +10,19 @@ Library: protools (Shared Workspace)
 def build_index():
     index_data = {
       "library": "protools",
+      "permissions": {"editors": "all", "viewers": "all", "commenters": "all", "access": "public"},
       "functions": [
-        {"name": "branch_module_builder", "description": "Spawns isolated Tiangan branch folders with local config."},
-        {"name": "branch_module_remover", "description": "Stateless cleanup of isolated functional branches."},
-        {"name": "session_closer", "description": "Clean 5-step shutdown of the Tiangan session."},
-        {"name": "system_index_builder", "description": "Portal indexer for decentralized branch discovery."}
+        {"name": "ui_pulse", "description": "Trigger a visual pulse on the interface."},
+        {"name": "task_sort", "description": "Reorganize tasks based on neural priority."},
+        {"name": "new_module_builder", "description": "CLI tool to spawn a new standalone Tiangan module directory (db{suffix})."},
+        {"name": "module_remover", "description": "Securely delete a module and scrub its manifest entry via ritual handshake."},
+        {"name": "session_closer", "description": "Perform a clean 5-step shutdown and lock the orchestration session."},
+        {"name": "system_index_builder", "description": "Generates the root portal landing page logic."}
       ],
       "metadata": {
           "generated_at": datetime.now().isoformat(),
-          "architecture": "Tiangan v0.2.8"
+          "owner": "community",
+          "location": "db/workspace/protools"
       }
     }
     path = "../../../../../db/protools_index.json"
@@ -0,0 +1,103 @@
+"""
+DBug ToolKit Codec Module (Node 00)
+===================================
+Multi-symbol BBCBOOK codec: table maps whose keys are whole tokens
+(bits, nibbles, bytes or any mix) encode through a precomputed n-gram
+lookup and decode back through a compiled regex automaton, so large
+captures round-trip in linear time.
+"""
+
+import functools
+import re
+
+from .core import MAX_TABLE_ENTRIES, BBCTable, block_width
+
+COMPILED_CODEC_CACHE = 64
+
+class CodecError(ValueError):
+    """Raised for tables that cannot round-trip and for undecodable input."""
+
+def binary_token_table(width: int, words: list) -> dict:
+    """Build a table mapping every `width`-bit token ("0000", "0001", ...) to words[i]."""
+    if len(words) != 2 ** width:
+        raise CodecError(f"A {width}-bit table needs {2 ** width} words, got {len(words)}.")
+    return {format(i, f"0{width}b"): word for i, word in enumerate(words)}
+
+def _alternation(tokens) -> str:
+    # Longest first, so the regex engine always takes the longest match
+    return "|".join(re.escape(t) for t in sorted(tokens, key=len, reverse=True))
+
+class TokenCodec:
+    """
+    Compiled encoder/decoder pair for a {token: word} table map.
+    Words must be unique and prefix-free so every encoding decodes unambiguously.
+    """
+
+    def __init__(self, table_map: dict, max_entries: int = MAX_TABLE_ENTRIES):
+        if not table_map:
+            raise CodecError("Empty table map.")
+        if any(not isinstance(k, str) or not k for k in table_map):
+            raise CodecError("Tokens must be non-empty strings.")
+        words = sorted(table_map.values())
+        if any(not isinstance(w, str) or not w for w in words):
+            raise CodecError("Words must be non-empty strings.")
+        for shorter, longer in zip(words, words[1:]):
+            if longer.startswith(shorter):
+                raise CodecError(f"Words are not prefix-free: {shorter!r} / {longer!r}.")
+
+        self.table_map = dict(table_map)
+        self.inverse = {word: token for token, word in table_map.items()}
+        widths = {len(k) for k in table_map}
+        self.token_width = widths.pop() if len(widths) == 1 else None
+
+        if self.token_width:
+            # Fixed-width tokens reuse core's n-gram table
+            self._blocks = BBCTable(self.table_map, block_width(len(table_map), max_entries), self.token_width)
+            self._encode_re = None
+        else:
+            self._blocks = None
+            self._encode_re = re.compile(f"{_alternation(table_map)}|.", re.S)
+        self._decode_re = re.compile(f"{_alternation(self.inverse)}|.", re.S)
+
+    def encode(self, cluster: str) -> str:
+        """Encode a cluster; symbols that form no token encode as '?'."""
+        if self._blocks is not None:
+            return self._blocks.encode(cluster)
+        pieces = self._encode_re.findall(cluster)
+        return "".join(self.table_map.get(p, "?") for p in pieces)
+
+    def decode(self, text: str) -> str:
+        """Decode BBCBOOK words back to tokens; raises CodecError on unknown words."""
+        pieces = self._decode_re.findall(text)
+        try:
+            return "".join(map(self.inverse.__getitem__, pieces))
+        except KeyError:
+            offset = 0
+            for piece in pieces:
+                if piece not in self.inverse:
+                    raise CodecError(f"Undecodable input at offset {offset}: {piece!r}") from None
+                offset += len(piece)
+            raise
+
+@functools.lru_cache(maxsize=COMPILED_CODEC_CACHE)
+def _compile_items(items: frozenset) -> TokenCodec:
+    return TokenCodec(dict(items))
+
+def compile_codec(table_map: dict) -> TokenCodec:
+    """Compile a table map once; equal table maps share one cached TokenCodec."""
+    if isinstance(table_map, TokenCodec):
+        return table_map
+    try:
+        key = frozenset(table_map.items())
+    except TypeError:
+        # Unhashable words are rejected by TokenCodec itself
+        return TokenCodec(table_map)
+    return _compile_items(key)
+
+def encode_tokens(cluster: str, table_map: dict) -> str:
+    """Multi-symbol encode; the compiled codec is cached per table map."""
+    return compile_codec(table_map).encode(cluster)
+
+def decode_from_bbcword(text: str, table_map: dict) -> str:
+    """Inverse of encode_to_bbcword / encode_tokens for a prefix-free table map."""
+    return compile_codec(table_map).decode(text)
@@ -5,28 +5,150 @@ This module provides the foundational functionality for parsing,
 encoding, auditing, and previewing binary-to-BBCBOOK conversions.
 """
 
+import functools
+import itertools
+import mmap
+import os
+import re
+import zlib
 from datetime import datetime
+from typing import Iterable, Iterator, TextIO, Union
+
+from .logwriter import get_log_writer
 
 SUMMARY_PATH = "bbc_book_summary_260119.txt"
 
+HEADER_SIZE = 8
+CHECKSUM_SIZE = 4
+PROBE_CHUNK_SIZE = 1 << 20
+ENCODE_CHUNK_SIZE = 1 << 20
+MAX_TABLE_ENTRIES = 4096
+MAX_BLOCK_WIDTH = 16
+# Below this many symbols a per-symbol join beats splitting into n-gram blocks
+SMALL_CLUSTER = 256
+COMPILED_TABLE_CACHE = 64
+
 def binary_probe(stream: str) -> dict:
     """Analyse the structure of a binary input stream."""
-    header = stream[:8]
-    payload = stream[8:-4]
-    checksum = stream[-4:]
     return {
-        "header": header,
+        "header": stream[:HEADER_SIZE],
+        "payload_length": max(len(stream) - HEADER_SIZE - CHECKSUM_SIZE, 0),
+        "checksum": stream[-CHECKSUM_SIZE:],
+    }
+
+def _probe_view(view: memoryview, chunk_size: int) -> dict:
+    """Probe a byte view in place; the payload is only ever sliced, never copied."""
+    payload = view[HEADER_SIZE:len(view) - CHECKSUM_SIZE] if len(view) >= HEADER_SIZE + CHECKSUM_SIZE else view[0:0]
+    checksum = bytes(view[-CHECKSUM_SIZE:])
+
+    crc = 0
+    for offset in range(0, len(payload), chunk_size):
+        crc = zlib.crc32(payload[offset:offset + chunk_size], crc)
+
+    return {
+        "header": bytes(view[:HEADER_SIZE]),
         "payload_length": len(payload),
         "checksum": checksum,
+        "checksum_valid": len(checksum) == CHECKSUM_SIZE and crc == int.from_bytes(checksum, "big"),
     }
 
+def binary_probe_buffer(source: Union[bytes, bytearray, memoryview, str, os.PathLike],
+                        chunk_size: int = PROBE_CHUNK_SIZE) -> dict:
+    """
+    Zero-copy variant of binary_probe for bytes-like objects or file paths.
+    Paths are mapped with mmap, and the big-endian CRC32 trailer is validated
+    chunk by chunk, so memory use stays constant regardless of input size.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        with memoryview(source) as view:
+            return _probe_view(view.cast("B"), chunk_size)
+
+    with open(source, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return _probe_view(memoryview(b""), chunk_size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return _probe_view(view, chunk_size)
+
+class BBCTable(dict):
+    """
+    A table_map compiled into an n-gram lookup: every block of up to `width`
+    symbols maps straight to its encoded words, so a cluster is encoded with
+    one C-level regex split plus one dict lookup per block. Symbols are
+    single characters by default; `token_width` lets fixed-width tokens
+    ("0000", "0001", ...) share the same machinery.
+    """
+
+    def __init__(self, symbols: dict, width: int, token_width: int = 1):
+        super().__init__()
+        self.symbols = symbols
+        self.width = width
+        self.token_width = token_width
+        self.pattern = re.compile(f".{{1,{width * token_width}}}", re.S)
+        for block in itertools.product(symbols, repeat=width):
+            self["".join(block)] = "".join(symbols[c] for c in block)
+
+    def __missing__(self, block: str) -> str:
+        # Short tail blocks and blocks with unmapped symbols
+        step = self.token_width
+        return "".join(self.symbols.get(block[i:i + step], "?") for i in range(0, len(block), step))
+
+    def encode(self, cluster: str) -> str:
+        return "".join(map(self.__getitem__, self.pattern.findall(cluster)))
+
+def block_width(symbol_count: int, max_entries: int = MAX_TABLE_ENTRIES) -> int:
+    """Largest number of symbols per block whose n-gram table fits in max_entries."""
+    width = 1
+    while width < MAX_BLOCK_WIDTH and symbol_count ** (width + 1) <= max_entries:
+        width += 1
+    return width
+
+def _build_table(table_map: dict, max_entries: int) -> BBCTable:
+    # Only single-character keys can ever match a per-symbol lookup
+    symbols = {k: v for k, v in table_map.items() if isinstance(k, str) and len(k) == 1}
+    return BBCTable(symbols, block_width(len(symbols), max_entries))
+
+@functools.lru_cache(maxsize=COMPILED_TABLE_CACHE)
+def _compile_items(items: frozenset, max_entries: int) -> BBCTable:
+    return _build_table(dict(items), max_entries)
+
+def compile_table(table_map: dict, max_entries: int = MAX_TABLE_ENTRIES) -> BBCTable:
+    """
+    Compile a {symbol: word} table_map; equal table maps share one cached
+    compiled table, so callers passing plain dicts do not rebuild it per call.
+    """
+    if isinstance(table_map, BBCTable):
+        return table_map
+    try:
+        key = frozenset(table_map.items())
+    except TypeError:
+        # Unhashable words cannot be cached; compile this one directly
+        return _build_table(table_map, max_entries)
+    return _compile_items(key, max_entries)
+
 def encode_to_bbcword(binary_cluster: str, table_map: dict) -> str:
     """Convert a verified binary sequence into BBCBOOK lexical form."""
-    return "".join(table_map.get(bit, "?") for bit in binary_cluster)
+    if len(binary_cluster) < SMALL_CLUSTER and not isinstance(table_map, BBCTable):
+        return "".join(table_map.get(bit, "?") for bit in binary_cluster)
+    return compile_table(table_map).encode(binary_cluster)
+
+def encode_stream(chunks: Iterable[str], table_map: dict) -> Iterator[str]:
+    """Encode an iterable of cluster chunks lazily with a single compiled table."""
+    table = compile_table(table_map)
+    for chunk in chunks:
+        yield table.encode(chunk)
+
+def encode_file(source: TextIO, target: TextIO, table_map: dict, chunk_size: int = ENCODE_CHUNK_SIZE) -> int:
+    """Stream-encode a text file larger than memory; returns the symbols read."""
+    table = compile_table(table_map)
+    total = 0
+    while chunk := source.read(chunk_size):
+        target.write(table.encode(chunk))
+        total += len(chunk)
+    return total
 
-def append_to_summary(log_entry: str):
-    """Write structured audit data directly into the session summary file."""
+def append_to_summary(log_entry: str, session: str = None):
+    """Queue structured audit data for the session summary file via the shared log writer."""
     timestamp = datetime.utcnow().isoformat()
     formatted = f"[{timestamp}] {log_entry}\n"
-    with open(SUMMARY_PATH, "a", encoding="utf-8") as f:
-        f.write(formatted)
+    get_log_writer().write(SUMMARY_PATH, formatted, session=session)
@@ -0,0 +1,396 @@
+"""
+DBug ToolKit Log Writer (Node 00)
+=================================
+Shared, buffered BBC BOOK log writer. Lines are queued to a background
+thread that keeps one open handle per log file, batches writes, and
+flushes according to the OFF factor of the session:
+
+    0  SILENT    never force a flush; buffers drain when full or at shutdown
+    1  BUFFERED  flush when a batch fills or the flush interval elapses
+    2  LIVE      flush as soon as the queue drains
+
+Segments rotate on size (and optionally age) into gzip or lzma files made
+of independent ~64 KB members. Every session gets its own pair of sidecars
+under <log>.sessions/: an active one for the uncompressed tail and a sealed
+index mapping time ranges to (member offset, offset in member, length)
+triples, so read_session() only touches that session's records and only
+decompresses the members holding its lines.
+
+Several processes may share one log: each batch is appended under an
+exclusive flock with offsets taken from the real end of file, and a writer
+whose segment was sealed underneath it follows the path to the new one.
+"""
+
+import atexit
+import bisect
+import fcntl
+import gzip
+import hashlib
+import json
+import logging
+import lzma
+import os
+import queue
+import threading
+import time
+import zlib
+from typing import List, Optional
+
+OFF_SILENT = "0"
+OFF_BUFFERED = "1"
+OFF_LIVE = "2"
+
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 1.0
+ROTATE_BYTES = 16 * 1024 * 1024
+MEMBER_BYTES = 64 * 1024
+
+COMPRESSORS = {
+    "gzip": (".gz", gzip.compress, lambda: zlib.decompressobj(31)),
+    "lzma": (".xz", lzma.compress, lzma.LZMADecompressor),
+}
+
+ACTIVE_SUFFIX = ".active.jsonl"
+INDEX_SUFFIX = ".index.jsonl"
+
+_STOP = object()
+
+def _sessions_dir(path: str) -> str:
+    return f"{path}.sessions"
+
+def _session_key(session: Optional[str]) -> str:
+    # Session IDs are free-form (or None); hash them into safe file names
+    return hashlib.sha1(json.dumps(session).encode("utf-8")).hexdigest()[:16]
+
+def _index_path(path: str, session: Optional[str]) -> str:
+    return os.path.join(_sessions_dir(path), _session_key(session) + INDEX_SUFFIX)
+
+def _active_index_path(path: str, session: Optional[str]) -> str:
+    return os.path.join(_sessions_dir(path), _session_key(session) + ACTIVE_SUFFIX)
+
+def _same_file(fd: int, path: str) -> bool:
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    held = os.fstat(fd)
+    return (held.st_dev, held.st_ino) == (current.st_dev, current.st_ino)
+
+def _open_locked(path: str, operation: int):
+    """Open path for reading and flock it, retrying until the lock is on the file currently at path."""
+    while True:
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        fcntl.flock(f.fileno(), operation)
+        if _same_file(f.fileno(), path):
+            return f
+        f.close()
+
+class _Segment:
+    """The open, uncompressed tail of one log; lines reach it in locked batches."""
+
+    def __init__(self, path: str, buffering: int):
+        self.path = path
+        self.buffering = buffering
+        os.makedirs(_sessions_dir(path), exist_ok=True)
+        self.log = None
+        self._reopen()
+        self.pending = []
+        self.pending_bytes = 0
+        self.opened_at = time.time()
+
+    def _reopen(self) -> None:
+        if self.log is not None:
+            self.log.close()
+        self.log = open(self.path, "ab")
+        self.size = os.fstat(self.log.fileno()).st_size
+
+    def _lock(self) -> None:
+        # Another process may have sealed the file we hold; follow the path to the live segment
+        while True:
+            fcntl.flock(self.log.fileno(), fcntl.LOCK_EX)
+            if _same_file(self.log.fileno(), self.path):
+                return
+            fcntl.flock(self.log.fileno(), fcntl.LOCK_UN)
+            self._reopen()
+
+    def write(self, line: str, session: Optional[str]) -> None:
+        data = line.encode("utf-8")
+        self.pending.append((session, time.time(), data))
+        self.pending_bytes += len(data)
+        self.size += len(data)
+        if self.pending_bytes >= self.buffering:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        self._lock()
+        try:
+            offset = os.fstat(self.log.fileno()).st_size
+            records = {}
+            for session, t, data in self.pending:
+                records.setdefault(session, []).append(json.dumps({"t": t, "o": offset, "n": len(data)}) + "\n")
+                offset += len(data)
+            self.log.write(b"".join(data for _, _, data in self.pending))
+            self.log.flush()
+            for session, lines in records.items():
+                with open(_active_index_path(self.path, session), "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+            self.size = offset
+        finally:
+            fcntl.flock(self.log.fileno(), fcntl.LOCK_UN)
+        self.pending.clear()
+        self.pending_bytes = 0
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self.log.close()
+
+def seal_segment(path: str, compression: str = "gzip") -> Optional[str]:
+    """
+    Compress the current uncompressed segment of path into the next numbered
+    segment file and fold each session's active sidecar into its sealed index.
+    Holds the segment's flock throughout, so concurrent writers wait and then
+    reopen a fresh segment.
+    """
+    raw = _open_locked(path, fcntl.LOCK_EX)
+    if raw is None:
+        return None
+    with raw:
+        if os.fstat(raw.fileno()).st_size == 0:
+            return None
+        extension, compress, _ = COMPRESSORS[compression]
+        sessions_dir = _sessions_dir(path)
+        os.makedirs(sessions_dir, exist_ok=True)
+        sequence_path = os.path.join(sessions_dir, "sequence")
+        try:
+            with open(sequence_path, "r", encoding="utf-8") as f:
+                sequence = int(f.read() or 0) + 1
+        except FileNotFoundError:
+            sequence = 1
+        segment = f"{path}.{sequence:06d}{extension}"
+
+        # Compress line-aligned blocks as independent members so each is seekable
+        block_starts, member_offsets = [], []
+        with open(f"{segment}.tmp", "wb") as out:
+            offset = 0
+            while True:
+                block = raw.read(MEMBER_BYTES)
+                if not block:
+                    break
+                tail = raw.readline()
+                block += tail
+                block_starts.append(offset)
+                member_offsets.append(out.tell())
+                out.write(compress(block))
+                offset += len(block)
+        os.replace(f"{segment}.tmp", segment)
+        with open(f"{sequence_path}.tmp", "w", encoding="utf-8") as f:
+            f.write(str(sequence))
+        os.replace(f"{sequence_path}.tmp", sequence_path)
+
+        for name in os.listdir(sessions_dir):
+            if not name.endswith(ACTIVE_SUFFIX):
+                continue
+            active_path = os.path.join(sessions_dir, name)
+            found = None
+            with open(active_path, "r", encoding="utf-8") as f:
+                for record in f:
+                    entry = json.loads(record)
+                    i = bisect.bisect_right(block_starts, entry["o"]) - 1
+                    if found is None:
+                        found = {"start": entry["t"], "end": entry["t"], "entries": []}
+                    found["end"] = max(found["end"], entry["t"])
+                    found["entries"].append([member_offsets[i], entry["o"] - block_starts[i], entry["n"]])
+            if found is not None:
+                with open(os.path.join(sessions_dir, name[:-len(ACTIVE_SUFFIX)] + INDEX_SUFFIX), "a", encoding="utf-8") as f:
+                    f.write(json.dumps({
+                        "sequence": sequence,
+                        "segment": os.path.basename(segment),
+                        "compression": compression,
+                        **found
+                    }) + "\n")
+            os.remove(active_path)
+        os.remove(path)
+        return segment
+
+def read_session(path, session: Optional[str], start: Optional[float] = None,
+                 end: Optional[float] = None) -> List[str]:
+    """Return one session's lines (optionally within [start, end]) across sealed and active segments."""
+    path = os.fspath(path)
+    directory = os.path.dirname(path)
+    lines = []
+
+    def in_range(t_start, t_end):
+        return (start is None or t_end >= start) and (end is None or t_start <= end)
+
+    # A shared lock keeps a concurrent seal from moving entries between the two sidecars mid-read
+    log = _open_locked(path, fcntl.LOCK_SH)
+    try:
+        if os.path.exists(_index_path(path, session)):
+            with open(_index_path(path, session), "r", encoding="utf-8") as f:
+                records = [json.loads(r) for r in f]
+            for record in records:
+                if not in_range(record["start"], record["end"]):
+                    continue
+                decompressor = COMPRESSORS[record["compression"]][2]
+                members = {}
+                with open(os.path.join(directory, record["segment"]), "rb") as seg:
+                    for member_offset, inner, length in record["entries"]:
+                        if member_offset not in members:
+                            seg.seek(member_offset)
+                            d = decompressor()
+                            chunks = []
+                            while not d.eof:
+                                chunk = seg.read(MEMBER_BYTES)
+                                if not chunk:
+                                    break
+                                chunks.append(d.decompress(chunk))
+                            members[member_offset] = b"".join(chunks)
+                        lines.append(members[member_offset][inner:inner + length].decode("utf-8"))
+
+        if log is not None and os.path.exists(_active_index_path(path, session)):
+            with open(_active_index_path(path, session), "r", encoding="utf-8") as f:
+                for record in f:
+                    entry = json.loads(record)
+                    if in_range(entry["t"], entry["t"]):
+                        log.seek(entry["o"])
+                        lines.append(log.read(entry["n"]).decode("utf-8"))
+    finally:
+        if log is not None:
+            log.close()
+    return lines
+
+class BBCLogWriter:
+    """Background writer; write() never touches the filesystem on the caller's thread."""
+
+    def __init__(self, off_mode: str = OFF_BUFFERED, flush_bytes: int = FLUSH_BYTES,
+                 flush_interval: float = FLUSH_INTERVAL, rotate_bytes: Optional[int] = ROTATE_BYTES,
+                 rotate_seconds: Optional[float] = None, compression: str = "gzip"):
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.off_mode = str(off_mode)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compression = compression
+        self._queue = queue.SimpleQueue()
+        self._handles = {}
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="bbc-log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, path, line: str, session: Optional[str] = None) -> None:
+        """Queue one line for path; the line should already end in a newline."""
+        if self._closed:
+            raise ValueError("BBCLogWriter is closed.")
+        self._queue.put((os.fspath(path), line, session))
+
+    def flush(self) -> None:
+        """
+        Block until everything queued so far is on disk. Returns at once on a
+        closed writer (close() already flushed); raises if the writer thread died.
+        """
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        while not done.wait(self.flush_interval):
+            if self._closed:
+                return
+            if not self._thread.is_alive():
+                raise RuntimeError("BBCLogWriter thread has stopped; queued lines were not written.")
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _handle(self, path: str) -> _Segment:
+        handle = self._handles.get(path)
+        if handle is None:
+            handle = self._handles[path] = _Segment(path, self.flush_bytes)
+        return handle
+
+    def _rotate_if_due(self, path: str, handle: _Segment) -> None:
+        too_big = self.rotate_bytes and handle.size >= self.rotate_bytes
+        too_old = self.rotate_seconds and time.time() - handle.opened_at >= self.rotate_seconds
+        if too_big or too_old:
+            handle.close()
+            del self._handles[path]
+            seal_segment(path, self.compression)
+
+    def _flush_all(self) -> None:
+        for path, handle in self._handles.items():
+            try:
+                handle.flush()
+            except OSError as e:
+                logging.warning(f"Failed to flush BBC log at {path}: {e}")
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def _due(self) -> bool:
+        if self.off_mode == OFF_SILENT:
+            return False
+        if self.off_mode == OFF_LIVE:
+            return True
+        return self._pending >= self.flush_bytes or time.monotonic() - self._last_flush >= self.flush_interval
+
+    def _run(self) -> None:
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._pending and self._due():
+                    self._flush_all()
+                continue
+
+            if item is _STOP:
+                self._flush_all()
+                for handle in self._handles.values():
+                    handle.close()
+                self._handles.clear()
+                return
+            if isinstance(item, threading.Event):
+                self._flush_all()
+                item.set()
+                continue
+
+            path, line, session = item
+            try:
+                handle = self._handle(path)
+                handle.write(line, session)
+                self._pending += len(line)
+                self._rotate_if_due(path, handle)
+            except OSError as e:
+                logging.warning(f"Failed to update BBC log at {path}: {e}")
+            # Batch everything already queued before deciding to flush
+            if self._queue.empty() and self._due():
+                self._flush_all()
+
+_shared_writer: Optional[BBCLogWriter] = None
+_shared_lock = threading.Lock()
+
+def get_log_writer(off_mode: Optional[str] = None) -> BBCLogWriter:
+    """
+    Return the process-wide writer, creating it (in off_mode) on first use.
+    An explicit off_mode is applied to an existing writer as well.
+    """
+    global _shared_writer
+    with _shared_lock:
+        if _shared_writer is None or _shared_writer._closed:
+            _shared_writer = BBCLogWriter(off_mode if off_mode is not None else OFF_BUFFERED)
+            atexit.register(_shared_writer.close)
+        elif off_mode is not None:
+            _shared_writer.off_mode = str(off_mode)
+        return _shared_writer